@@ -0,0 +1,188 @@
+from __future__ import annotations
+import os, pickle, socket, sqlite3, sys, threading, time, traceback
+from contextlib import contextmanager
+from multiprocessing import Process
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Minimal task broker for spreading experiment cells over hosts: a SQLite file
+# on shared storage.  A task is a pickled (function, args) pair; functions must
+# be importable module-level callables on every worker host.  Tasks carry the
+# publisher's namespace (by default the name of the __main__ script, which is
+# where functions defined in it unpickle from) and workers only claim tasks of
+# their own namespace, so main.py workers never pick up gamix.py tasks.
+#
+#   publisher:  Broker(db).publish("main", [(key, fn, args), ...])
+#   any host:   Broker(db).work()                     (or spawn(db, n) locally)
+#   collector:  Broker(db).results("main")
+#
+# Workers heartbeat while a task runs; a running task whose heartbeat is older
+# than `lease` seconds is considered lost and handed out again, up to
+# `max_attempts` times, after which it is marked failed.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id         INTEGER PRIMARY KEY,
+    namespace  TEXT NOT NULL DEFAULT '',
+    experiment TEXT NOT NULL,
+    key        TEXT NOT NULL,
+    payload    BLOB NOT NULL,
+    state      TEXT NOT NULL DEFAULT 'pending',   -- pending | running | done | failed
+    attempts   INTEGER NOT NULL DEFAULT 0,
+    worker     TEXT,
+    heartbeat  REAL,
+    result     BLOB,
+    error      TEXT,
+    UNIQUE (experiment, key)
+);
+"""
+INDEX = "CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (namespace, state, id)"
+
+
+def default_namespace() -> str:
+    """Name of the running __main__ script ("main" for main.py)."""
+    path = getattr(sys.modules["__main__"], "__file__", None) or "__main__"
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+class Broker:
+    """SQLite-backed task queue with leases, heartbeats and retries."""
+
+    def __init__(self, path: str, lease: float = 120.0, max_attempts: int = 3,
+                 namespace: str | None = None) -> None:
+        self.path, self.lease, self.max_attempts = path, lease, max_attempts
+        self.namespace = namespace or default_namespace()
+        db = sqlite3.connect(path, timeout=60)
+        db.executescript(SCHEMA)
+        if "namespace" not in [c[1] for c in db.execute("PRAGMA table_info(tasks)")]:   # pre-namespace file
+            db.execute("ALTER TABLE tasks ADD COLUMN namespace TEXT NOT NULL DEFAULT ''")
+        db.execute(INDEX)
+        db.commit()
+        db.close()
+
+    @contextmanager
+    def _tx(self):
+        db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    # ---------- publisher / collector --------------------------------------
+    def publish(self, experiment: str, tasks: Iterable[Tuple[str, Callable, tuple]]) -> int:
+        """Add tasks (key, fn, args); keys already present are left alone. Returns # added."""
+        rows = [(self.namespace, experiment, key, pickle.dumps((fn, args))) for key, fn, args in tasks]
+        with self._tx() as db:
+            before = db.total_changes
+            db.executemany("INSERT OR IGNORE INTO tasks (namespace, experiment, key, payload) "
+                           "VALUES (?, ?, ?, ?)", rows)
+            return db.total_changes - before
+
+    def progress(self, experiment: str) -> Dict[str, int]:
+        with self._tx() as db:
+            rows = db.execute("SELECT state, COUNT(*) FROM tasks WHERE experiment = ? GROUP BY state",
+                              (experiment,)).fetchall()
+        return {"pending": 0, "running": 0, "done": 0, "failed": 0, **dict(rows)}
+
+    def results(self, experiment: str) -> List[Tuple[str, tuple, Any]]:
+        """(key, args, result) of every finished task, in publication order."""
+        with self._tx() as db:
+            rows = db.execute("SELECT key, payload, result FROM tasks WHERE experiment = ? "
+                              "AND state = 'done' ORDER BY id", (experiment,)).fetchall()
+        return [(key, pickle.loads(p)[1], pickle.loads(r)) for key, p, r in rows]
+
+    def failures(self, experiment: str) -> List[Tuple[str, str]]:
+        with self._tx() as db:
+            return db.execute("SELECT key, error FROM tasks WHERE experiment = ? AND state = 'failed'",
+                              (experiment,)).fetchall()
+
+    # ---------- worker side ------------------------------------------------
+    def claim(self, worker: str) -> Tuple[int, bytes] | None:
+        """Lease the oldest pending task of our namespace (after re-queuing lost ones)."""
+        now = time.time()
+        with self._tx() as db:
+            db.execute("UPDATE tasks SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                       "error = 'lease expired on ' || worker "
+                       "WHERE state = 'running' AND heartbeat < ?", (self.max_attempts, now - self.lease))
+            row = db.execute("SELECT id, payload FROM tasks WHERE namespace = ? AND state = 'pending' "
+                             "ORDER BY id LIMIT 1", (self.namespace,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE tasks SET state = 'running', attempts = attempts + 1, worker = ?, "
+                       "heartbeat = ? WHERE id = ?", (worker, now, row[0]))
+        return row[0], row[1]
+
+    def heartbeat(self, task_id: int, worker: str) -> None:
+        with self._tx() as db:
+            db.execute("UPDATE tasks SET heartbeat = ? WHERE id = ? AND worker = ? AND state = 'running'",
+                       (time.time(), task_id, worker))
+
+    def complete(self, task_id: int, worker: str, result: Any) -> None:
+        with self._tx() as db:
+            db.execute("UPDATE tasks SET state = 'done', result = ?, error = NULL "
+                       "WHERE id = ? AND worker = ? AND state = 'running'",
+                       (pickle.dumps(result), task_id, worker))
+
+    def fail(self, task_id: int, worker: str, error: str) -> None:
+        with self._tx() as db:
+            db.execute("UPDATE tasks SET state = CASE WHEN attempts < ? THEN 'pending' ELSE 'failed' END, "
+                       "error = ? WHERE id = ? AND worker = ? AND state = 'running'",
+                       (self.max_attempts, error, task_id, worker))
+
+    def work(self, worker: str | None = None, poll: float = 2.0, exit_when_idle: bool = True) -> int:
+        """
+        Run tasks until none are pending (or forever if not exit_when_idle);
+        a background thread heartbeats the current task. Returns # completed.
+        """
+        worker = worker or f"{socket.gethostname()}:{os.getpid()}"
+        done = 0
+        while True:
+            task = self.claim(worker)
+            if task is None:
+                if exit_when_idle and not self._open_counts():
+                    return done
+                time.sleep(poll)
+                continue
+            task_id, payload = task
+            stop = threading.Event()
+            beat = threading.Thread(target=self._beat, args=(task_id, worker, stop), daemon=True)
+            beat.start()
+            try:                            # an unloadable payload fails like the task itself
+                fn, args = pickle.loads(payload)
+                result = fn(args)
+            except Exception:
+                self.fail(task_id, worker, traceback.format_exc())
+            else:
+                self.complete(task_id, worker, result)
+                done += 1
+            finally:
+                stop.set()
+                beat.join()
+
+    def _beat(self, task_id: int, worker: str, stop: threading.Event) -> None:
+        while not stop.wait(self.lease / 4):
+            self.heartbeat(task_id, worker)
+
+    def _open_counts(self) -> Dict[str, int]:
+        with self._tx() as db:
+            rows = db.execute("SELECT state, COUNT(*) FROM tasks WHERE namespace = ? "
+                              "AND state IN ('pending', 'running') GROUP BY state", (self.namespace,)).fetchall()
+        return dict(rows)
+
+
+def _work(path: str, lease: float, max_attempts: int, namespace: str) -> None:
+    Broker(path, lease, max_attempts, namespace).work()
+
+
+def spawn(path: str, n: int, lease: float = 120.0, max_attempts: int = 3,
+          namespace: str | None = None) -> None:
+    """Start `n` worker processes on this host and wait for them."""
+    namespace = namespace or default_namespace()    # resolved here: children may see another __main__
+    procs = [Process(target=_work, args=(path, lease, max_attempts, namespace)) for _ in range(n)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+import os, pickle
+from typing import Any, Dict
+
+# Solver checkpoints for long runs on preemptible machines:
+#
+#   ga.run(data, sched, checkpoint="runs/la30.ckpt", checkpoint_every=10)
+#   tabu_search(data, checkpoint="runs/la30_ts.ckpt", checkpoint_every=50)
+#
+# If the file exists the run resumes from it, otherwise it starts fresh; a
+# resumed run continues exactly where the last checkpoint left it (same RNG
+# stream, counters and incumbent).  A checkpoint is one pickle (protocol 5,
+# numpy arrays stored as raw buffers) written to a temporary file, fsynced and
+# then renamed over the old one, so a crash mid-write never corrupts it.  It
+# records the run's parameters and seed, and a run with different ones refuses
+# to resume from it; a run that finishes removes its checkpoint.
+
+
+def save_checkpoint(path: str, state: Dict[str, Any]) -> None:
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(state, f, protocol=5)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: str | None, kind: str, **expect) -> Dict[str, Any] | None:
+    """
+    The checkpoint at `path` (None if there is none). Its solver `kind` and
+    every `expect` entry (e.g. problem size) must match the run resuming it.
+    """
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, "rb") as f:
+        state = pickle.load(f)
+    for k, v in {"kind": kind, **expect}.items():
+        if state.get(k) != v:
+            raise ValueError(f"checkpoint {path}: {k} is {state.get(k)!r}, expected {v!r}")
+    return state
+
+
+def clear_checkpoint(path: str | None) -> None:
+    """Remove the checkpoint of a finished run."""
+    if path and os.path.exists(path):
+        os.remove(path)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+import math, time
+from typing import Dict, List
+
+import numpy as np
+
+# Convergence traces: best-so-far makespan against evaluations and wall time.
+#
+#   conv = Convergence()
+#   ga.run(data, sched, trace=conv)        # or tabu_search(..., trace=conv)
+#   conv.arrays()                          # {"evals", "seconds", "best"}
+#
+# Only improvements are kept while running; arrays() thins them to the last
+# improvement per logarithmic evaluation bin (plus the final point), so a run
+# of 10^6 evaluations leaves at most ~6 × bins_per_decade points.  The result
+# is a step function: best[i] holds from evals[i] until evals[i + 1].
+
+
+class Convergence:
+    """Best-so-far recorder; solvers call record() once per iteration or generation."""
+
+    def __init__(self) -> None:
+        self.t0 = time.perf_counter()
+        self.evals: List[int] = []
+        self.seconds: List[float] = []
+        self.best: List[float] = []
+        self.last = (0, 0.0)                # (evaluations, seconds) of the latest call
+
+    def __getstate__(self):                 # checkpoints keep elapsed time, not the clock
+        return {**vars(self), "t0": time.perf_counter() - self.t0}
+
+    def __setstate__(self, state):
+        vars(self).update(state, t0=time.perf_counter() - state["t0"])
+
+    def record(self, evals: int, best: float) -> None:
+        now = time.perf_counter() - self.t0
+        self.last = (evals, now)
+        if not self.best or best < self.best[-1]:
+            self.evals.append(evals)
+            self.seconds.append(now)
+            self.best.append(best)
+
+    def arrays(self, bins_per_decade: int = 10) -> Dict[str, np.ndarray]:
+        keep: Dict[int, int] = {}
+        for i, e in enumerate(self.evals):  # later improvements overwrite earlier ones
+            keep[int(math.log10(max(e, 1)) * bins_per_decade)] = i
+        idx = sorted(keep.values())
+        evals = [self.evals[i] for i in idx]
+        seconds = [self.seconds[i] for i in idx]
+        best = [self.best[i] for i in idx]
+        if self.best and self.last[0] > evals[-1]:
+            evals.append(self.last[0]); seconds.append(self.last[1]); best.append(self.best[-1])
+        return {"evals": np.array(evals, dtype=np.int64),
+                "seconds": np.array(seconds, dtype=np.float32),
+                "best": np.array(best, dtype=np.float64)}
+
+
+def save_traces(path: str, runs: List[Dict[str, np.ndarray]]) -> None:
+    """One .npz per result cell: the runs' arrays concatenated, `rep` marks the run."""
+    runs = [r for r in runs if r is not None]
+    if not runs:
+        return
+    np.savez_compressed(
+        path,
+        rep=np.concatenate([np.full(len(r["evals"]), k, dtype=np.int32) for k, r in enumerate(runs)]),
+        **{f: np.concatenate([r[f] for r in runs]) for f in ("evals", "seconds", "best")})
+
+
+def load_traces(path: str) -> List[Dict[str, np.ndarray]]:
+    with np.load(path) as z:
+        rep = z["rep"]
+        return [{f: z[f][rep == k] for f in ("evals", "seconds", "best")} for k in np.unique(rep)]
@@ -0,0 +1,45 @@
+from __future__ import annotations
+import random
+from typing import Any, Dict, List
+
+# Job-based permutation encoding shared by the solvers, the dispatcher and the
+# rescheduling service: a chromosome lists each job id once per operation, and
+# the k-th occurrence of job j stands for j's k-th operation.
+#
+#   seq = random_solution(data["jobs"])          # [0, 2, 1, 0, 2, 1, …]
+#   ops = decode(seq, data["jobs"])              # Scheduler input
+#   seq = repair(seq, data)                      # after jobs were added
+
+
+def random_solution(jobs, rng=random):
+    """Create a random job‐based permutation (one entry per operation)."""
+    seq = [jid for jid, ops in enumerate(jobs) for _ in ops]
+    rng.shuffle(seq)
+    return seq
+
+
+def decode(sol, jobs):
+    """
+    Translate a job‐sequence (e.g. [0,2,1,0,2,1,…]) into an operation list
+    [ ((job_id, op_idx), (mach, dur)), … ] for the scheduler.
+    """
+    idx = [0] * len(jobs)
+    out = []
+    for jid in sol:
+        m, t = jobs[jid][idx[jid]]
+        out.append(((jid, idx[jid]), (m, t)))
+        idx[jid] += 1
+    return out
+
+
+def repair(seq, data: Dict[str, Any]) -> List[int]:
+    """`seq` made valid for data["jobs"]: surplus genes dropped, missing ones appended."""
+    need = [len(ops) for ops in data["jobs"]]
+    out = []
+    for j in seq:
+        j = int(j)
+        if j < len(need) and need[j] > 0:
+            out.append(j); need[j] -= 1
+    for j, k in enumerate(need):
+        out += [j] * k
+    return out
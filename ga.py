@@ -1,30 +1,122 @@
-import random, numpy as np
-from copy import deepcopy
+import numpy as np
 from typing import List, Tuple
 
+from scheduler import BudgetExhausted, Scheduler
+from checkpoint import clear_checkpoint, load_checkpoint, save_checkpoint
+
 Op = Tuple[Tuple[int, int], Tuple[int, int]]          # ((job,op),(mach,dur))
 
+VARIATION = ("cx", "mut", "cx+mut")                    # arms for adaptive control
+MUTATIONS = ("swap", "insert")
+
+
+class AdaptivePursuit:
+    """Adaptive pursuit over a fixed set of arms (Thierens, 2005)."""
+    def __init__(self, arms, rng, p_min=0.1, alpha=0.3, beta=0.3):
+        self.arms, self.rng = list(arms), rng
+        k = len(self.arms)
+        self.p_min = min(p_min, 1.0 / k)
+        self.p_max = 1.0 - (k - 1) * self.p_min
+        self.alpha, self.beta = alpha, beta
+        self.p = np.full(k, 1.0 / k)
+        self.q = np.zeros(k)
+
+    def draw(self, n: int) -> np.ndarray:
+        return self.rng.choice(len(self.arms), size=n, p=self.p)
+
+    def update(self, arm: np.ndarray, reward: np.ndarray) -> None:
+        """Move quality estimates toward the mean reward of each arm played."""
+        for a in np.unique(arm):
+            self.q[a] += self.alpha * (reward[arm == a].mean() - self.q[a])
+        target = np.full(len(self.arms), self.p_min)
+        target[np.argmax(self.q)] = self.p_max
+        self.p += self.beta * (target - self.p)
+        self.p /= self.p.sum()
+
+    def rates(self) -> dict:
+        return {a: round(float(p), 4) for a, p in zip(self.arms, self.p)}
+
 class GeneticAlgorithm:
+    """
+    Population is a contiguous (pop_size × n_ops) int16/int32 matrix of job
+    IDs with fitness in a parallel array; selection and mutation are batched.
+    """
     def __init__(self, instance_data: dict,
                  pop_size=200, num_generations=1000,
                  crossover_rate=0.95, mutation_rate=0.05,
                  elitism_rate=0.10, local_search_swaps=30,
-                 seed_ratio=0.25, rng_seed=None):
+                 seed_ratio=0.25, rng_seed=None, mutation="swap", screen=None,
+                 dedup=False, adaptive=False, local_search="random",
+                 robust=None, robust_samples=8, robust_max_samples=128, robust_scenarios=None,
+                 replacement="generational", offspring=2):
+        # everything a checkpoint must match to be resumed by this GA
+        self._config = {k: v for k, v in locals().items() if k not in ("self", "instance_data")}
         self.data   = instance_data
         self.NP, self.G = pop_size, num_generations
         self.cx, self.mut = crossover_rate, mutation_rate
         self.elite, self.ls, self.seed = elitism_rate, local_search_swaps, seed_ratio
-        self.rng = random.Random(rng_seed)
+        self.mutation = mutation                        # "swap" | "insert"
+        self.local_search = local_search                # "random" | "critical"
+        self.rng = np.random.default_rng(rng_seed)
+        self.counts = np.array([len(ops) for ops in self.data["jobs"]], dtype=np.int64)
+        self.dtype  = np.int16 if len(self.counts) <= np.iinfo(np.int16).max else np.int32
+        self.pop = self.fit = None                      # final population after run()
+        # optional screening: a child whose bound from simulating the first
+        # `screen` fraction of its ops already reaches the k-th best fitness
+        # cannot enter the elite set and is not fully evaluated
+        self.screen = screen
+        self.job_work  = [sum(d for _, d in ops) for ops in self.data["jobs"]]
+        self.mach_work = [0] * self.data["num_machines"]
+        for ops in self.data["jobs"]:
+            for m, d in ops: self.mach_work[m] += d
+        self.stats = {}
+        # optional deduplication on the canonical (per-machine order) form:
+        # equivalent individuals reuse a memoised fitness, and duplicates
+        # inside one population are replaced by fresh random individuals; the
+        # memo keeps the current and previous generation's keys only
+        self.dedup, self._memo, self._memo_old = dedup, {}, {}
+        n_ops = int(self.counts.sum())
+        self._sorted = np.repeat(np.arange(len(self.counts)), self.counts)
+        self._rank = np.arange(n_ops) - (np.cumsum(self.counts) - self.counts)[self._sorted]
+        self._mach = np.zeros((len(self.counts), int(self.counts.max(initial=1))), dtype=np.int32)
+        for j, ops in enumerate(self.data["jobs"]):
+            self._mach[j, :len(ops)] = [m for m, _ in ops]
+        # optional adaptive control: pursuit over variation operators,
+        # mutation operators and local-search depth, credited by improvement
+        self.adaptive = adaptive
+        self._ls_depths = sorted({0, self.ls // 2, self.ls})
+        # optional robust fitness: "mean" or a quantile (e.g. 0.9) of the
+        # makespan over S scenarios (Scheduler.sample_scenarios keywords in
+        # robust_scenarios), resampled once per generation and shared by all
+        # individuals (common random numbers); S doubles up to
+        # robust_max_samples while the elite cut is not statistically clear
+        self.robust, self.robust_kw = robust, dict(robust_scenarios or {})
+        self.S0, self.S_max = robust_samples, max(robust_samples, robust_max_samples)
+        self._scen, self._samples = None, {}
+        # replacement: "generational" (elites + a full set of children per
+        # generation) or "steady" (per step, `offspring` children replace the
+        # worst individuals they beat; a generation is as many children as
+        # the generational mode makes). Either way fitness stays with the
+        # individual, and only new or changed individuals are evaluated
+        self.steady, self.offspring = replacement == "steady", offspring
 
     # ---------- population ---------------------------------------------------
+    def _rand_pop(self, k: int) -> np.ndarray:
+        base = np.repeat(np.arange(len(self.counts), dtype=self.dtype), self.counts)
+        return self.rng.permuted(np.tile(base, (k, 1)), axis=1)
+
     def _rand_ind(self) -> List[int]:
-        counts = [len(ops) for ops in self.data["jobs"]]
-        seq = np.repeat(np.arange(len(counts)), counts)
-        self.rng.shuffle(seq);  return seq.tolist()
+        return self._rand_pop(1)[0].tolist()
 
-    def _init_pop(self, heuristic):
-        return [heuristic(self.data) if heuristic and self.rng.random() < self.seed
-                else self._rand_ind() for _ in range(self.NP)]
+    def _init_pop(self, heuristic, seeds=None) -> np.ndarray:
+        pop = self._rand_pop(self.NP)
+        if heuristic:
+            for r in np.flatnonzero(self.rng.random(self.NP) < self.seed):
+                pop[r] = heuristic(self.data)
+        if seeds is not None:                           # warm start
+            seeds = np.asarray(seeds, dtype=self.dtype)[:self.NP]
+            pop[:len(seeds)] = seeds
+        return pop
 
     # ---------- decoding / fitness ------------------------------------------
     @staticmethod
@@ -34,69 +126,476 @@ class GeneticAlgorithm:
             m, d = data["jobs"][j][p[j]]; out.append(((j, p[j]), (m, d))); p[j] += 1
         return out
 
-    def _fit(self, ind, sched):  return sched.calculate_makespan(self._decode(ind, self.data))
+    def _fit(self, ind, sched):
+        self.stats["evaluations"] = self.stats.get("evaluations", 0) + 1
+        return self._sim(ind, self._decode(ind.tolist(), self.data), sched)
+
+    def _sim(self, ind, ops, sched):
+        if self.robust is None:
+            return sched.calculate_makespan(ops)
+        x = sched.makespans(ops, self._scen)
+        self._samples[ind.tobytes()] = x
+        return float(x.mean()) if self.robust == "mean" else float(np.quantile(x, self.robust))
+
+    def _evaluate(self, pop, sched, threshold=None, keys=None, known=None) -> np.ndarray:
+        """Fitness of every row; rows with a `known` (not NaN) fitness are not re-scored."""
+        fit = np.empty(len(pop), dtype=np.int64 if self.robust is None else np.float64)
+        for r, ind in enumerate(pop):
+            if known is not None and not np.isnan(known[r]):
+                fit[r] = known[r]
+                continue
+            if keys is not None and (hit := self._recall(keys[r])) is not None:
+                fit[r] = hit
+                self.stats["dedup_hits"] = self.stats.get("dedup_hits", 0) + 1
+                continue
+            fit[r], exact = self._score(ind, sched, threshold)
+            if exact and keys is not None:
+                self._memo[keys[r]] = fit[r]
+            if exact and (self._scored is None or fit[r] < self._scored[1]):
+                self._scored = (ind.copy(), fit[r].item())  # survives a budget cut mid-population
+        return fit
+
+    def _recall(self, key):
+        """Memoised fitness of `key` (None if unknown); a hit stays for the next generation."""
+        if key not in self._memo and key in self._memo_old:
+            self._memo[key] = self._memo_old[key]
+        return self._memo.get(key)
+
+    def _score(self, ind, sched, threshold=None):
+        """(fitness, exact): the bound replaces fitness if it reaches `threshold`."""
+        if threshold is None or not self.screen:
+            return self._fit(ind, sched), True
+        ops = self._decode(ind.tolist(), self.data)
+        prefix = int(self.screen * len(ops))
+        lb = sched.makespan_bound(ops, prefix, self.job_work, self.mach_work)
+        self.stats["screen_cost"] = self.stats.get("screen_cost", 0.0) + prefix / max(len(ops), 1)
+        if lb >= threshold:
+            self.stats["screened"] = self.stats.get("screened", 0) + 1
+            return lb, False
+        self.stats["evaluations"] = self.stats.get("evaluations", 0) + 1
+        return self._sim(ind, ops, sched), True
+
+    def _canonical(self, pop) -> List[int]:
+        """
+        Vectorised canonical keys: genes re-ordered stably by the machine of
+        the operation they denote, i.e. the per-machine job order.
+        """
+        order = np.argsort(pop, axis=1, kind="stable")
+        occ = np.empty(pop.shape, dtype=np.int64)
+        np.put_along_axis(occ, order, np.broadcast_to(self._rank, pop.shape), axis=1)
+        mach = self._mach[pop, occ]
+        canon = np.take_along_axis(pop, np.argsort(mach, axis=1, kind="stable"), axis=1)
+        return [hash(row.tobytes()) for row in canon]
+
+    def _dedup(self, pop):
+        """Replace repeated schedules (keeping the first) by random individuals."""
+        keys = self._canonical(pop)
+        seen, dup = set(), []
+        for r, k in enumerate(keys):
+            if k in seen: dup.append(r)
+            else: seen.add(k)
+        if dup:
+            pop[dup] = self._rand_pop(len(dup))
+            self.stats["duplicates"] = self.stats.get("duplicates", 0) + len(dup)
+            for r, k in zip(dup, self._canonical(pop[dup])): keys[r] = k
+        return keys
 
     # ---------- GA operators -------------------------------------------------
-    def _select(self, pop, fit):
-        i, j = self.rng.randrange(self.NP), self.rng.randrange(self.NP)
-        return pop[i] if fit[i] < fit[j] else pop[j]
+    def _select(self, fit, n) -> np.ndarray:
+        """n binary tournaments at once; returns winner row indices."""
+        a, b = self.rng.integers(len(fit), size=(2, n))
+        return np.where(fit[a] < fit[b], a, b)
 
     def _cx(self, p1, p2):
         """Order-based crossover that preserves duplicate job IDs."""
-        size = len(p1)
-        pos  = self.rng.sample(range(size), k=size // 2)
-        c1, c2 = [None] * size, [None] * size
-
-        # copy selected positions
-        for i in pos:
-            c1[i] = p1[i]
-            c2[i] = p2[i]
-
-        # required number of occurrences for each job
-        job_cnt = {j: p1.count(j) for j in set(p1)}
-
-        def _fill(child, parent):
-            cnt = {j: 0 for j in job_cnt}
-            for g in child:
-                if g is not None:
-                    cnt[g] += 1
-            for i in range(size):
-                if child[i] is None:
-                    for g in parent:
-                        if cnt[g] < job_cnt[g]:
-                            child[i] = g
-                            cnt[g] += 1
-                            break
-
-        _fill(c1, p2)
-        _fill(c2, p1)
-        return c1, c2
-
-
-    def _mut(self, ind):
-        i, j = self.rng.sample(range(len(ind)), 2); ind[i], ind[j] = ind[j], ind[i]; return ind
-
-    def _ls(self, ind, sched):
-        best, fbest = ind, self._fit(ind, sched)
-        for _ in range(self.ls):
-            cand = self._mut(ind.copy()); f = self._fit(cand, sched)
-            if f < fbest: best, fbest = cand, f
-        return best
+        size = p1.size
+        keep = np.zeros(size, dtype=bool)
+        keep[self.rng.choice(size, size // 2, replace=False)] = True
+        return self._fill(p1, p2, keep), self._fill(p2, p1, keep)
+
+    def _fill(self, donor, parent, keep):
+        # genes of `donor` stay at `keep`; every free slot takes the first job
+        # of `parent` (in order of first appearance) still short of its count
+        child = donor.copy()
+        need  = self.counts - np.bincount(donor[keep], minlength=len(self.counts))
+        jobs, first = np.unique(parent, return_index=True)
+        order = jobs[np.argsort(first)]
+        child[~keep] = np.repeat(order, need[order])
+        return child
+
+    def _mutate(self, pop, rows, op=None):
+        """Swap (or insert) mutation applied in place to pop[rows]."""
+        k, n = len(rows), pop.shape[1]
+        if k == 0 or n < 2:
+            return pop
+        i = self.rng.integers(n, size=k)
+        j = (i + self.rng.integers(1, n, size=k)) % n        # j != i
+        if (op or self.mutation) == "insert":
+            pop[rows] = self._insert(pop[rows], i, j)
+        else:
+            pop[rows, i], pop[rows, j] = pop[rows, j], pop[rows, i]
+        return pop
+
+    @staticmethod
+    def _insert(block, i, j):
+        """Move gene i to position j in every row, shifting the genes between."""
+        k = np.arange(block.shape[1])[None, :]
+        i, j = i[:, None], j[:, None]
+        src = np.where((i < j) & (k >= i) & (k < j), k + 1, k)
+        src = np.where((i > j) & (k > j) & (k <= i), k - 1, src)
+        src = np.where(k == j, i, src)
+        return np.take_along_axis(block, src, axis=1)
+
+    def _ls(self, ind, sched, fbest=None, depth=None):
+        depth = self.ls if depth is None else depth
+        best = ind
+        if fbest is None: fbest = self._fit(ind, sched)
+        if depth and self.local_search == "critical":
+            return self._ls_critical(ind, sched, fbest, depth)
+        if depth:
+            cands = self._mutate(np.tile(ind, (depth, 1)), np.arange(depth))
+            f = self._evaluate(cands, sched); k = int(np.argmin(f))
+            if f[k] < fbest: best, fbest = cands[k], f[k].item()
+        return best, fbest
+
+    def _ls_critical(self, ind, sched, fbest, depth):
+        """
+        First-improvement descent over critical-block moves: an operation of a
+        critical block goes to the block's front or back (single moves that
+        can shorten the critical path), within `depth` evaluations. The
+        improved sequence is returned for write-back (Lamarckian).
+        """
+        best, spent = ind, 0
+        while spent < depth:
+            moves = self._block_moves(best, self._critical_blocks(best, sched))
+            if not moves:
+                break
+            src, dst = np.array(moves).T
+            order = self.rng.permutation(len(moves))[:depth - spent]
+            for c in self._insert(np.tile(best, (len(order), 1)), src[order], dst[order]):
+                spent += 1
+                f = self._fit(c, sched)
+                if f < fbest:
+                    best, fbest = c, f
+                    break
+            else:
+                break                                   # local optimum
+        return best, fbest
+
+    def _critical_blocks(self, ind, sched) -> List[List[int]]:
+        """
+        Critical path of the decoded schedule, split into blocks (maximal runs
+        of machine-adjacent operations) of at least two gene positions.
+        """
+        tl = sched.timeline(self._decode(ind.tolist(), self.data))
+        self.stats["evaluations"] = self.stats.get("evaluations", 0) + 1   # a full simulation too
+        n = len(ind)
+        m_prev, j_prev, last_m, last_j = [-1] * n, [-1] * n, {}, {}
+        for i, (m, j) in enumerate(zip(tl.machine.tolist(), tl.job.tolist())):
+            m_prev[i], j_prev[i] = last_m.get(m, -1), last_j.get(j, -1)
+            last_m[m] = last_j[j] = i
+        start, finish = tl.start.tolist(), tl.finish.tolist()
+        i, path = int(np.argmax(tl.finish)), []
+        while i >= 0:                                   # walk back along tight arcs
+            path.append(i)
+            p = m_prev[i]
+            if p < 0 or finish[p] != start[i]:
+                p = j_prev[i] if j_prev[i] >= 0 and finish[j_prev[i]] == start[i] else -1
+            i = p
+        path.reverse()
+        blocks = [[path[0]]]
+        for a, b in zip(path, path[1:]):
+            if m_prev[b] == a: blocks[-1].append(b)
+            else: blocks.append([b])
+        return [b for b in blocks if len(b) > 1]
+
+    @staticmethod
+    def _block_moves(ind, blocks) -> List[Tuple[int, int]]:
+        """
+        (src, dst) gene moves that put a block operation at the block's front
+        or back. A move is kept only if it passes no gene of the same job, so
+        every other machine order and job's op numbering is unchanged.
+        """
+        moves = []
+        for blk in blocks:
+            first, last = blk[0], blk[-1]
+            front = [(v, first) for v in blk[1:] if not (ind[first:v] == ind[v]).any()]
+            back = [(u, last) for u in blk[:-1] if not (ind[u + 1:last + 1] == ind[u]).any()]
+            if len(blk) == 2 and front:                 # both are the same swap
+                back = []
+            moves += front + back
+        return moves
+
+    # ---------- robust fitness ----------------------------------------------
+    def _resample(self, sched):
+        """Fresh common scenarios for the next generation; memoised fitness is void."""
+        self._scen = sched.sample_scenarios(self.data["jobs"], self._S, rng=self.rng, **self.robust_kw)
+        self._samples, self._memo, self._memo_old = {}, {}, {}
+
+    def _grow(self, fit, elite_k):
+        """
+        Double S when the individuals either side of the elite cut (best and
+        runner-up if all are elite) are not separated by their paired
+        per-scenario difference: |mean| < 2 standard errors.
+        """
+        if self._S >= self.S_max or len(fit) < 2:
+            return
+        order = np.argsort(fit, kind="stable")
+        i = min(elite_k, len(fit) - 1)
+        xa = self._samples.get(self.pop[order[i - 1]].tobytes())
+        xb = self._samples.get(self.pop[order[i]].tobytes())
+        if xa is None or xb is None:                    # memoised via dedup
+            return
+        d = xb - xa
+        sd = d.std(ddof=1)
+        if sd > 0 and abs(d.mean()) < 2 * sd / np.sqrt(self._S):
+            self._S = min(2 * self._S, self.S_max)
+
+    # ---------- checkpoints ---------------------------------------------------
+    def _checkpoint(self, path, gen, pop, known, thr, prov, best, sched, trace):
+        """Everything the main loop needs to continue at generation `gen`."""
+        save_checkpoint(path, {
+            "kind": "GA", "shape": pop.shape, "gen": gen, "pop": pop, "known": known,
+            **self._tag, "thr": thr, "prov": prov, "best": best, "rng": self.rng.bit_generator.state,
+            "stats": self.stats, "memo": (self._memo_old, self._memo), "S": self._S, "scen": self._scen,
+            "samples": self._samples, "ap": getattr(self, "_ap", None),
+            "kid_reward": getattr(self, "_kid_reward", 0.0),
+            "evaluations": sched.evaluations, "trace": trace})
+
+    def _restore(self, ck, sched, trace):
+        self.rng.bit_generator.state = ck["rng"]
+        self.stats, (self._memo_old, self._memo), self._S = ck["stats"], ck["memo"], ck["S"]
+        self._scen, self._samples, self._kid_reward = ck["scen"], ck["samples"], ck["kid_reward"]
+        if ck["ap"] is not None:                        # pursuit draws from the GA's generator
+            self._ap = ck["ap"]
+            for ap in self._ap.values():
+                ap.rng = self.rng
+        sched.evaluations = ck["evaluations"]
+        if trace is not None and ck["trace"] is not None:
+            vars(trace).update(vars(ck["trace"]))
+        return ck["gen"], ck["pop"], ck["known"], ck["thr"], ck["prov"], ck["best"]
+
+    # ---------- adaptive control --------------------------------------------
+    def _adaptive_vary(self, kids, parent_fit):
+        """Vary `kids` in place with pursuit-drawn operators; returns provenance."""
+        pairs = len(kids) // 2
+        arm = self._ap["variation"].draw(pairs)
+        for a in 2 * np.flatnonzero(arm != VARIATION.index("mut")):
+            kids[a], kids[a + 1] = self._cx(kids[a], kids[a + 1])
+        pf = parent_fit.reshape(pairs, 2)
+        crossed = (arm != VARIATION.index("mut"))[:, None]
+        pf = np.where(crossed, pf.min(axis=1, keepdims=True), pf).ravel()
+        rows = np.flatnonzero(np.repeat(arm != VARIATION.index("cx"), 2))
+        mop = np.full(len(kids), -1)
+        mop[rows] = self._ap["mutation"].draw(len(rows))
+        for o, name in enumerate(MUTATIONS):
+            self._mutate(kids, np.flatnonzero(mop == o), op=name)
+        return {"arm": np.repeat(arm, 2), "mop": mop, "pf": pf}
+
+    def _credit(self, prov, fit, thr):
+        """Reward = relative improvement of each child over its (best) parent."""
+        n = len(fit)
+        pf = prov["pf"][:n]
+        reward = np.maximum(pf - fit, 0) / np.maximum(pf, 1)
+        if thr is not None:                     # screened children hold only a bound
+            reward[fit >= thr] = 0.0
+        self._kid_reward = float(reward.mean()) if n else 0.0
+        self._ap["variation"].update(prov["arm"][:n], reward)
+        mutated = prov["mop"][:n] >= 0
+        if mutated.any():
+            self._ap["mutation"].update(prov["mop"][:n][mutated], reward[mutated])
+
+    def _adaptive_ls(self, elites, fit, sched):
+        """
+        LS depth per elite drawn by pursuit; reward is improvement per
+        evaluation, with depth 0 credited the children's mean reward (the
+        value of spending that budget on offspring instead).
+        """
+        ap = self._ap["ls_depth"]
+        arm = ap.draw(len(elites))
+        reward, out = np.empty(len(elites)), fit.copy()
+        for r, a in enumerate(arm):
+            depth = self._ls_depths[a]
+            elites[r], out[r] = self._ls(elites[r], sched, fit[r].item(), depth)
+            reward[r] = ((fit[r] - out[r]) / max(fit[r], 1) / depth if depth
+                         else getattr(self, "_kid_reward", 0.0))
+        ap.update(arm, reward)
+        return out
 
     # ---------- main loop ----------------------------------------------------
-    def run(self, instance_data, scheduler, heuristic_func=None):
-        pop = self._init_pop(heuristic_func)
-        for _ in range(self.G):
-            fit = [self._fit(ind, scheduler) for ind in pop]
-            elite_k = max(1, int(self.elite * self.NP))
-            elite_idx = np.argsort(fit)[:elite_k]
-            new_pop = [self._ls(deepcopy(pop[i]), scheduler) for i in elite_idx]
-            while len(new_pop) < self.NP:
-                p1, p2 = self._select(pop, fit), self._select(pop, fit)
-                c1, c2 = (self._cx(p1, p2) if self.rng.random() < self.cx else (p1.copy(), p2.copy()))
-                if self.rng.random() < self.mut: self._mut(c1)
-                if self.rng.random() < self.mut: self._mut(c2)
-                new_pop.extend([c1, c2])
-            pop = new_pop[:self.NP]
-        best = min(pop, key=lambda ind: self._fit(ind, scheduler))
-        return best, self._fit(best, scheduler)
+    def run(self, instance_data, scheduler, heuristic_func=None, seeds=None, trace=None,
+            checkpoint=None, checkpoint_every=10):
+        """
+        Returns (best_sequence, makespan). `seeds` (sequences, e.g. a previous
+        run's self.pop) replace the first rows of the initial population. Afterwards self.stats holds
+        "evaluations" (full simulations, critical-path timelines included)
+        and, with screening, "screened" (children skipped), "screen_cost"
+        (bound work in evaluations, also charged to the scheduler) and
+        "screen_saved" (net evaluations saved; negative = not worth it);
+        with dedup, "dedup_hits" (memoised fitness reused) and "duplicates"
+        (individuals replaced); with adaptive, "rates" (learned operator and
+        local-search probabilities); with robust, "samples" (final S). In
+        robust mode the returned makespan is the robust estimate of the last
+        generation's best individual. `trace` (a convergence.Convergence)
+        records the best so far against scheduler evaluations every generation.
+        With `checkpoint` (a path) the full state is saved every
+        `checkpoint_every` generations, a run with the same parameters, seed
+        and heuristic finding the file resumes from it, and the file is
+        removed when the run ends (see checkpoint.py).
+        If the scheduler's budget runs out (BudgetExhausted) the run stops and
+        returns the best individual evaluated so far, even if the budget did
+        not cover the initial population (self.fit is then None); with no
+        evaluation at all, the first initial individual is scored outside
+        the budget.
+        """
+        self.stats = {"evaluations": 0, "screened": 0, "screen_cost": 0.0,
+                      "dedup_hits": 0, "duplicates": 0}
+        self._memo, self._memo_old, self._scored = {}, {}, None
+        elite_k = max(1, int(self.elite * self.NP))
+        thr, prov = None, None
+        if self.adaptive:
+            self._ap = {"variation": AdaptivePursuit(VARIATION, self.rng),
+                        "mutation": AdaptivePursuit(MUTATIONS, self.rng),
+                        "ls_depth": AdaptivePursuit(self._ls_depths, self.rng)}
+        best = None                                     # (sequence, makespan)
+        self._S = self.S0
+        known = None                                    # carried fitness, NaN = unknown
+        steps = max(1, (self.NP - elite_k) // self.offspring)
+        self._tag = {"params": self._config, "heuristic": getattr(heuristic_func, "__name__", None)}
+        ckpt = load_checkpoint(checkpoint, "GA", shape=(self.NP, int(self.counts.sum())), **self._tag)
+        try:
+            if ckpt is not None:
+                start, pop, known, thr, prov, best = self._restore(ckpt, scheduler, trace)
+            else:
+                start, pop = 0, self._init_pop(heuristic_func, seeds)
+                if self.robust is not None:
+                    self._resample(scheduler)
+            for g in range(start, self.G):
+                if checkpoint and g > start and g % checkpoint_every == 0:
+                    self._checkpoint(checkpoint, g, pop, known, thr, prov, best, scheduler, trace)
+                self._memo_old, self._memo = self._memo, {}
+                keys = self._dedup(pop) if self.dedup else None
+                fit = self._evaluate(pop, scheduler, thr, keys, known)
+                best = self._incumbent(pop, fit, best)
+                if trace is not None:
+                    trace.record(scheduler.evaluations, best[1])
+                if prov is not None:
+                    self._credit(prov, fit[elite_k:], thr)
+                if self.steady:
+                    elite_idx = np.argsort(fit, kind="stable")[:elite_k]
+                    elites = pop[elite_idx]
+                    fit[elite_idx] = self._improve(elites, fit[elite_idx], scheduler)
+                    pop[elite_idx] = elites
+                    for _ in range(steps):
+                        self._steady_step(pop, fit, scheduler)
+                        best = self._incumbent(pop, fit, best)
+                    known = fit.astype(np.float64)
+                else:
+                    pop, prov, known = self._generation(pop, fit, scheduler, elite_k)
+                    if self.screen:
+                        if thr is not None:             # carried bounds are not fitness
+                            known[known >= thr] = np.nan
+                        thr = np.partition(fit, elite_k - 1)[elite_k - 1].item()
+                if self.robust is not None:
+                    self._grow(fit, elite_k)
+                    self._resample(scheduler)
+                if self.robust is not None or self.dedup:   # rescored anyway / memoised
+                    known = None
+            fit = self._evaluate(pop, scheduler, thr, self._canonical(pop) if self.dedup else None, known)
+            best = self._incumbent(pop, fit, best)
+            if trace is not None:
+                trace.record(scheduler.evaluations, best[1])
+            if prov is not None:
+                self._credit(prov, fit[elite_k:], thr)
+        except BudgetExhausted:
+            # scheduler budget spent: stop and keep the incumbent, or the best
+            # member of a partly scored first population
+            if best is None:
+                best = self._scored or (pop[0].copy(), self._sim(
+                    pop[0], self._decode(pop[0].tolist(), self.data), Scheduler(self.data["num_machines"])))
+                self.pop, self.fit = pop, None
+                if trace is not None:
+                    trace.record(scheduler.evaluations, best[1])
+            pop, fit = self.pop, self.fit
+        clear_checkpoint(checkpoint)
+        self.stats["screen_saved"] = self.stats["screened"] - self.stats["screen_cost"]
+        if self.robust is not None:
+            self.stats["samples"] = self._S
+        if self.adaptive:
+            var = self._ap["variation"].rates()
+            self.stats["rates"] = {
+                "crossover_rate": var["cx"] + var["cx+mut"],
+                "mutation_rate": var["mut"] + var["cx+mut"],
+                "variation": var,
+                "mutation": self._ap["mutation"].rates(),
+                "ls_depth": self._ap["ls_depth"].rates(),
+            }
+        self.pop, self.fit = pop, fit
+        return best[0].tolist(), best[1]
+
+    def _generation(self, pop, fit, sched, elite_k):
+        """
+        Elites (with local search) + selected, varied children. Also returns
+        the fitness the new population carries over (NaN where unknown): the
+        elites' after local search, and the parent's for unchanged children.
+        """
+        n_kids = self.NP - elite_k
+        new_pop = np.empty_like(pop)
+        known = np.full(self.NP, np.nan)
+        elite_idx = np.argsort(fit, kind="stable")[:elite_k]
+        new_pop[:elite_k] = pop[elite_idx]
+        known[:elite_k] = self._improve(new_pop[:elite_k], fit[elite_idx], sched)
+        sel = self._select(fit, n_kids + n_kids % 2)
+        kids, prov = self._vary(pop[sel], fit[sel])
+        new_pop[elite_k:] = kids[:n_kids]
+        same = (new_pop[elite_k:] == pop[sel[:n_kids]]).all(axis=1)
+        known[elite_k:][same] = fit[sel[:n_kids]][same]
+        return new_pop, prov, known
+
+    def _improve(self, elites, fit, sched):
+        """Local search on `elites` in place; returns their new fitness."""
+        if self.adaptive:
+            return self._adaptive_ls(elites, fit, sched)
+        out = fit.copy()
+        for r in range(len(elites)):
+            elites[r], out[r] = self._ls(elites[r], sched, fit[r].item())
+        return out
+
+    def _vary(self, kids, parent_fit):
+        """Crossover and mutation of selected parents (pairs), in place."""
+        if self.adaptive:
+            return kids, self._adaptive_vary(kids, parent_fit)
+        for a in 2 * np.flatnonzero(self.rng.random(len(kids) // 2) < self.cx):
+            kids[a], kids[a + 1] = self._cx(kids[a], kids[a + 1])
+        self._mutate(kids, np.flatnonzero(self.rng.random(len(kids)) < self.mut))
+        return kids, None
+
+    def _steady_step(self, pop, fit, sched):
+        """
+        One steady-state step, in place: `offspring` children of tournament
+        winners are evaluated and each replaces one of the worst individuals
+        if it beats it (best child against worst individual). With screening
+        the worst fitness is the threshold: a child bounded above it cannot
+        enter.
+        """
+        n = self.offspring
+        sel = self._select(fit, n + n % 2)
+        kids, prov = self._vary(pop[sel], fit[sel])
+        kids = kids[:n]
+        worst = np.argsort(fit, kind="stable")[::-1][:n]
+        thr = fit[worst[0]].item() if self.screen else None
+        kf = self._evaluate(kids, sched, thr, self._canonical(kids) if self.dedup else None)
+        if prov is not None:
+            self._credit(prov, kf, thr)
+        for k, w in zip(np.argsort(kf, kind="stable"), worst):
+            if kf[k] < fit[w]:
+                pop[w], fit[w] = kids[k], kf[k]
+
+    def _incumbent(self, pop, fit, best):
+        """Remember the last fully evaluated population and the best so far."""
+        self.pop, self.fit = pop, fit
+        b = int(np.argmin(fit))
+        # robust estimates of different generations use different scenarios
+        if best is None or self.robust is not None or fit[b] < best[1]:
+            best = (pop[b].copy(), fit[b].item())
+        return best
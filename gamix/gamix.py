@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os, csv, copy, statistics, random
+import argparse, os, csv, copy, statistics, random
 from typing import Dict
 from multiprocessing import Pool
 import pandas as pd
@@ -10,6 +10,7 @@ from heuristics import HEURISTICS
 from ga import GeneticAlgorithm
 from scheduler import Scheduler
 from rescheduler import simulate_with_rescheduling
+from broker import Broker, spawn
 
 random.seed(42)
 REPS = 10
@@ -35,9 +36,50 @@ def _ga_once(inst: dict, sid: int, hfun) -> int:
     )
     return hist[-1][1]
 
+def _ga_task(args) -> int:
+    return _ga_once(*args)
+
+def _write_summary(rows: list) -> None:
+    with open("results/summary.csv", "w", newline="") as f:
+        csv.writer(f).writerows(
+            [["Instance", "Scenario", "Algorithm", "MeanMakespan"], *rows]
+        )
+
+    df = pd.read_csv("results/summary.csv")
+    pivot = df.pivot_table(index=["Instance", "Scenario"],
+                           columns="Algorithm", values="MeanMakespan")
+    (pivot.subtract(pivot["GAMIX"], axis=0)
+          .to_csv("results/delta_vs_gamix.csv"))
+
 def main() -> None:
-    instances = load_instances("data.txt")
+    ap = argparse.ArgumentParser(description="GA seeding variants: mean makespan per cell")
+    ap.add_argument("--mode", choices=["local", "publish", "worker", "collect"], default="local",
+                    help="local: process pool on this host; publish / worker / collect: "
+                         "distribute the runs through the --broker task queue (see broker.py)")
+    ap.add_argument("--broker", default="results/gamix_broker.sqlite")
+    ap.add_argument("--workers", type=int, default=os.cpu_count())
+    a = ap.parse_args()
+    if a.mode == "worker":
+        spawn(a.broker, a.workers)
+        return
     os.makedirs("results", exist_ok=True)
+    if a.mode == "collect":
+        cells = {}
+        for key, _, mk in Broker(a.broker).results("gamix"):
+            inst, scen, hname, _ = key.split("|")
+            cells.setdefault((inst, scen, hname), []).append(mk)
+        _write_summary([[*cell, statistics.mean(mks)] for cell, mks in cells.items()])
+        return
+
+    instances = load_instances("data.txt")
+    if a.mode == "publish":
+        n = Broker(a.broker).publish("gamix", (
+            (f"{inst['name']}|{scen_name}|{hname}|{rep}", _ga_task, (inst, sid, hfun))
+            for inst in instances for scen_name, sid in SCENARIOS.items()
+            for hname, hfun in HEURISTICS.items() for rep in range(REPS)))
+        print(f"published {n} runs to {a.broker}")
+        return
+
     rows = []
     total = len(instances) * len(SCENARIOS) * len(HEURISTICS)
     with tqdm(total=total) as pbar:
@@ -52,16 +94,7 @@ def main() -> None:
                                  statistics.mean(mks)])
                     pbar.update(1)
 
-    with open("results/summary.csv", "w", newline="") as f:
-        csv.writer(f).writerows(
-            [["Instance", "Scenario", "Algorithm", "MeanMakespan"], *rows]
-        )
-
-    df = pd.read_csv("results/summary.csv")
-    pivot = df.pivot_table(index=["Instance", "Scenario"],
-                           columns="Algorithm", values="MeanMakespan")
-    (pivot.subtract(pivot["GAMIX"], axis=0)
-          .to_csv("results/delta_vs_gamix.csv"))
+    _write_summary(rows)
 
 if __name__ == "__main__":
     main()
@@ -1,10 +1,15 @@
 # EDV.py — Event-driven rescheduling visuals (FT06, illustrative timings)
 # Produces: step1_baseline.png ... step5_committed.png
 
+import os, sys
+import numpy as np
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
 import matplotlib as mpl
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gantt import draw_bars, LodLabels
+
 # ------------------------------ Config ---------------------------------
 EVENT_T = 14         # time when the new job arrives
 T_MAX   = 20         # right limit of the timeline
@@ -46,26 +51,33 @@ baseline = {
 }
 
 # -------------------------- Drawing helpers -----------------------------
-def annotate_bar_times(ax, x, w, y):
-    if w >= ANNOT_MIN_WIDTH:
-        txt = f"[{int(x)}–{int(x+w)}]"
-        ax.text(x + w/2, y, txt, ha='center', va='center', fontsize=FONT_SZ-1, color="black")
+def _time_label(x, w):
+    return f"[{int(x)}–{int(x+w)}]"
 
 def draw_schedule(ax, schedule, *, frozen=None, t_event=None, title=""):
     bar_h = 0.78
     y_max = len(schedule)
-    for m in sorted(schedule):
-        y = m
-        for (t0, dur, jid, lbl, col) in schedule[m]:
-            rect = Rectangle((t0, y-bar_h/2), dur, bar_h,
-                             facecolor=col, edgecolor='k', lw=0.6)
-            if frozen and (m, t0) in frozen:
-                rect.set_hatch("///")
-                rect.set_facecolor("#DDDDDD")
-            ax.add_patch(rect)
-            ax.text(t0 + dur*0.5, y, lbl, ha='center', va='center',
-                    fontsize=FONT_SZ-1, color='black')
-            annotate_bar_times(ax, t0, dur, y - bar_h*0.33)
+    blocks = [(m, *b) for m in sorted(schedule) for b in schedule[m]]
+    t0  = np.array([b[1] for b in blocks], dtype=float)
+    dur = np.array([b[2] for b in blocks], dtype=float)
+    row = np.array([b[0] for b in blocks], dtype=float)
+    lbl = [b[4] for b in blocks]
+    is_frozen = np.array([bool(frozen) and (b[0], b[1]) in frozen for b in blocks], dtype=bool)
+
+    # hatched collection for frozen blocks, live blocks drawn on top
+    if is_frozen.any():
+        draw_bars(ax, t0[is_frozen], dur[is_frozen], row[is_frozen], "#DDDDDD",
+                  height=bar_h, linewidths=0.6, hatch="///")
+    draw_bars(ax, t0[~is_frozen], dur[~is_frozen], row[~is_frozen],
+              [b[5] for b, f in zip(blocks, is_frozen) if not f], height=bar_h, linewidths=0.6)
+
+    ax.set_xlim(0, T_MAX)
+    ax.set_ylim(0.5, y_max + 0.55)
+    LodLabels(ax, t0, t0 + dur, row, lambda i: lbl[i], min_px=0,
+              fontsize=FONT_SZ-1, color='black')
+    tw, dw, rw = (a[dur >= ANNOT_MIN_WIDTH] for a in (t0, dur, row))
+    LodLabels(ax, tw, tw + dw, rw, lambda i: _time_label(tw[i], dw[i]), min_px=0,
+              y_offset=-bar_h*0.33, fontsize=FONT_SZ-1, color="black")
 
     if t_event is not None:
         ax.axvline(t_event, color='k', ls='--', lw=1.2)
@@ -73,11 +85,9 @@ def draw_schedule(ax, schedule, *, frozen=None, t_event=None, title=""):
         ax.text(t_event + 0.15, y_max - 0.35, "event",
                 fontsize=9, rotation=90, va='top', ha='left')
 
-    ax.set_xlim(0, T_MAX)
     ax.set_yticks(range(1, y_max+1))
     ax.set_yticklabels([f"M{m}" for m in sorted(schedule)])
     ax.set_xlabel("Time")
-    ax.set_ylim(0.5, y_max + 0.55)
     ax.set_title(title)
     ax.grid(axis='x', color='lightgray', linestyle=':', linewidth=0.5)
     ax.set_axisbelow(True)
@@ -0,0 +1,196 @@
+# build_figures.py — render all thesis figures in parallel, skipping unchanged ones
+#
+#   python illustrations/build_figures.py --results result --stats tests --out figures
+#
+# Result CSVs are loaded once; each figure receives only its slice of the data.
+# A figure is re-rendered only when the hash of that slice or of the function
+# that draws it changes (recorded in <out>/.manifest.json).
+import argparse, hashlib, inspect, json, os
+from multiprocessing import Pool
+
+import matplotlib
+matplotlib.use("Agg")  # must precede pyplot in parent and workers
+import pandas as pd
+
+# ---- config ----
+SCENARIOS = {
+    "Static": "results_static.csv",
+    "NewJob": "results_newjob.csv",
+    "Breakdown": "results_breakdown.csv",
+    "TimeNoise": "results_timenoise.csv",
+    "Mixed": "results_mixed.csv",
+}
+STATS = {
+    "friedman": "friedman_per_scenario.csv",
+    "nemenyi": "nemenyi_posthoc_results.csv",
+    "shapiro": "shapiro_results.csv",
+}
+ALGO_ORDER = ["GA", "GAKK", "GALPT", "GALRPT", "GAMIX", "GASPT", "GASRPT", "TS"]
+
+# --------------------------------------------------------------------------- #
+#  Renderers: (data, out_path) -> None                                        #
+# --------------------------------------------------------------------------- #
+def render_boxplot(df, out, scenario, instance):
+    import matplotlib.pyplot as plt
+    algos = [a for a in ALGO_ORDER if a in set(df["Algorithm"])]
+    algos += sorted(set(df["Algorithm"]) - set(algos))
+    data = [df.loc[df["Algorithm"] == a, "Makespan"].values for a in algos]
+    fig, ax = plt.subplots(figsize=(6.4, 4.8))
+    ax.boxplot(data, showfliers=True)
+    ax.set_xticks(range(1, len(algos) + 1), algos)
+    ax.set_title(f"{scenario} Scenario - Makespan Distribution for {instance}")
+    ax.set_xlabel("Algorithm")
+    ax.set_ylabel("Makespan")
+    fig.tight_layout()
+    fig.savefig(out, dpi=200)
+    plt.close(fig)
+
+
+def render_nemenyi_heatmap(df, out, scenario, instance):
+    import matplotlib.pyplot as plt
+    algos = sorted(set(df["Algorithm A"]) | set(df["Algorithm B"]))
+    heat = pd.DataFrame(0, index=algos, columns=algos)
+    for _, row in df[df["Nemenyi p-value"] < 0.05].iterrows():
+        heat.loc[row["Algorithm A"], row["Algorithm B"]] = 1
+        heat.loc[row["Algorithm B"], row["Algorithm A"]] = 1
+    fig, ax = plt.subplots(figsize=(8, 6))
+    ax.imshow(heat.values, cmap="Reds", vmin=0, vmax=1)
+    for i in range(len(algos)):
+        for j in range(len(algos)):
+            ax.text(j, i, heat.iat[i, j], ha="center", va="center")
+    ax.set_xticks(range(len(algos)), algos)
+    ax.set_yticks(range(len(algos)), algos)
+    ax.set_title(f"Significant Pairwise Differences (Nemenyi, {scenario}, {instance})")
+    ax.set_xlabel("Algorithm")
+    ax.set_ylabel("Algorithm")
+    fig.tight_layout()
+    fig.savefig(out, dpi=200)
+    plt.close(fig)
+
+
+def render_friedman_bar(df, out):
+    import matplotlib.pyplot as plt
+    sig_counts = (df["p-value"] < 0.05).groupby(df["Scenario"]).sum()
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sig_counts.plot(kind="bar", ax=ax)
+    ax.set_ylabel("Number of significant instances")
+    ax.set_title("Number of instances with significant algorithmic differences (Friedman test)")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+    fig.savefig(out, dpi=200)
+    plt.close(fig)
+
+
+def render_shapiro_bar(df, out):
+    import matplotlib.pyplot as plt
+    rejected = (df["Shapiro-Wilk p-value"] < 0.05).groupby(df["Scenario"]).sum()
+    fig, ax = plt.subplots(figsize=(7, 5))
+    rejected.plot(kind="bar", ax=ax)
+    ax.set_ylabel("Number of non-normal distributions")
+    ax.set_title("Number of makespan samples failing Shapiro–Wilk normality test")
+    ax.tick_params(axis="x", rotation=45)
+    fig.tight_layout()
+    fig.savefig(out, dpi=200)
+    plt.close(fig)
+
+# --------------------------------------------------------------------------- #
+#  Loading (once) and job planning                                            #
+# --------------------------------------------------------------------------- #
+def load_results(results_dir):
+    frames = []
+    for scen, fname in SCENARIOS.items():
+        path = os.path.join(results_dir, fname)
+        if not os.path.exists(path):
+            print(f"WARNING: {path} not found; skipping {scen}.")
+            continue
+        df = pd.read_csv(path).rename(columns=lambda c: c.strip())
+        df["Scenario"] = scen
+        frames.append(df[["Scenario", "Instance", "Algorithm", "Makespan"]])
+    if not frames:
+        return pd.DataFrame(columns=["Scenario", "Instance", "Algorithm", "Makespan"])
+    df = pd.concat(frames, ignore_index=True)
+    df["Instance"] = df["Instance"].astype(str).str.upper()
+    df["Makespan"] = pd.to_numeric(df["Makespan"], errors="coerce")
+    return df.dropna(subset=["Makespan"])
+
+
+def load_stats(stats_dir):
+    out = {}
+    for key, fname in STATS.items():
+        path = os.path.join(stats_dir, fname)
+        if os.path.exists(path):
+            df = pd.read_csv(path)
+            df["Scenario"] = df["Scenario"].astype(str).str.strip()
+            out[key] = df
+    return out
+
+
+def plan(results, stats, outdir):
+    """[(renderer, data, out_path, kwargs), …] for every figure we can draw."""
+    jobs = []
+    for (scen, inst), df in results.groupby(["Scenario", "Instance"], sort=False):
+        out = os.path.join(outdir, "boxplots", f"boxplot_{scen.lower()}_{inst.lower()}.png")
+        jobs.append((render_boxplot, df, out, {"scenario": scen, "instance": inst}))
+    if "nemenyi" in stats:
+        for (scen, inst), df in stats["nemenyi"].groupby(["Scenario", "Instance"], sort=False):
+            out = os.path.join(outdir, "heatmaps", f"nemenyi_{scen.lower()}_{inst.lower()}.png")
+            jobs.append((render_nemenyi_heatmap, df, out, {"scenario": scen, "instance": inst}))
+    if "friedman" in stats:
+        jobs.append((render_friedman_bar, stats["friedman"],
+                     os.path.join(outdir, "friedman_significant.png"), {}))
+    if "shapiro" in stats:
+        jobs.append((render_shapiro_bar, stats["shapiro"],
+                     os.path.join(outdir, "shapiro_rejected.png"), {}))
+    return jobs
+
+
+def fingerprint(renderer, df, kwargs) -> str:
+    """Hash of the figure's input slice plus the source of its renderer."""
+    h = hashlib.sha1(inspect.getsource(renderer).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    h.update(json.dumps(kwargs, sort_keys=True).encode())
+    return h.hexdigest()
+
+
+def _render(job):
+    renderer, df, out, kwargs = job
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    renderer(df, out, **kwargs)
+    return out
+
+# --------------------------------------------------------------------------- #
+def build(results_dir="result", stats_dir="tests", outdir="figures",
+          force=False, processes=None):
+    manifest_path = os.path.join(outdir, ".manifest.json")
+    manifest = {}
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    jobs, keys = [], {}
+    for job in plan(load_results(results_dir), load_stats(stats_dir), outdir):
+        renderer, df, out, kwargs = job
+        keys[out] = fingerprint(renderer, df, kwargs)
+        if manifest.get(out) != keys[out] or not os.path.exists(out):
+            jobs.append(job)
+
+    if jobs:
+        with Pool(processes) as pool:
+            for out in pool.imap_unordered(_render, jobs):
+                print("Saved:", out)
+    print(f"{len(jobs)} rendered, {len(keys) - len(jobs)} up to date")
+
+    os.makedirs(outdir, exist_ok=True)
+    with open(manifest_path, "w") as f:
+        json.dump(keys, f, indent=1, sort_keys=True)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--results", default="result")
+    ap.add_argument("--stats", default="tests")
+    ap.add_argument("--out", default="figures")
+    ap.add_argument("--force", action="store_true", help="ignore the manifest")
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="worker processes")
+    a = ap.parse_args()
+    build(a.results, a.stats, a.out, a.force, a.jobs)
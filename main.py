@@ -1,5 +1,5 @@
 from __future__ import annotations
-import os, csv, copy, random, statistics, tempfile
+import argparse, os, copy, random, statistics, time
 from typing import Dict, Tuple
 from multiprocessing import Pool
 
@@ -8,7 +8,10 @@ from heuristics import HEURISTICS
 from ga import GeneticAlgorithm
 from scheduler import Scheduler
 from rescheduler import simulate_with_rescheduling, simulate_ts_with_rescheduling
-from tabu import run_tabu_search
+from tabu import tabu_search
+from sinks import CsvSink, MemorySink, TraceSink
+from convergence import Convergence, save_traces
+from broker import Broker, spawn
 
 random.seed(42)
 REPS = 20
@@ -20,94 +23,205 @@ SCENARIOS: Dict[str, int] = {
     "TimeNoise": 3,
     "Mixed": 4,  # all events together
 }
+SCEN_NAMES = {sid: name for name, sid in SCENARIOS.items()}
+
+# Equal-budget mode (--evals / --seconds): every run, and every reschedule of a
+# dynamic run, gets the same Scheduler budget; iteration limits are lifted so
+# the budget alone decides when GA and TS stop.
+UNBOUNDED = 10**9
+COLUMNS = ["Instance", "Algorithm", "Makespan", "ScenarioID", "Evaluations", "CPUSeconds"]
+# Static runs also record a convergence trace (best so far against evaluations
+# and seconds, log-thinned); each cell's traces go to one .npz in this folder.
+CONV_DIR = "results/convergence"
 
 
 # ------------------------------------------------------------------  GA helper
-def _ga_static_once(data: dict, heuristic) -> int:
+def _ga_static_once(data: dict, heuristic, budget: dict | None = None) -> Tuple[int, int, dict]:
     ga = GeneticAlgorithm(
         data,
-        pop_size=200, num_generations=1_000,
+        pop_size=200, num_generations=UNBOUNDED if budget else 1_000,
         crossover_rate=0.95, mutation_rate=0.05,
         elitism_rate=0.10, local_search_swaps=30,
         seed_ratio=0.25,
     )
-    sched = Scheduler(num_machines=data["num_machines"])
-    _, mk = ga.run(data, sched, heuristic)
-    return mk
+    sched = Scheduler(num_machines=data["num_machines"], **(budget or {}))
+    conv = Convergence()
+    _, mk = ga.run(data, sched, heuristic, trace=conv)
+    return mk, sched.evaluations, conv.arrays()
 
 
-def _one_ga_run(args: Tuple[dict, int, str, callable]) -> int:
-    instance, scen_id, vname, hfun = args
+def _one_ga_run(args: Tuple[dict, int, str, callable, dict | None, int]) -> Tuple[int, int, float, list, dict]:
+    """(makespan, evaluations, CPU seconds, trace records, convergence arrays) of one GA run."""
+    instance, scen_id, vname, hfun, budget, rep = args
     inst = copy.deepcopy(instance)
+    t0 = time.process_time()
     if scen_id == 0:  # static
-        return _ga_static_once(inst, hfun)
+        mk, evals, conv = _ga_static_once(inst, hfun, budget)
+        return mk, evals, time.process_time() - t0, [], conv
+    stats, sink = {}, MemorySink()
     hist = simulate_with_rescheduling(
         inst, scenario_id=scen_id,
         variant_name=vname,
         heuristic_func=hfun,
         max_time=100,
+        ga_params={"num_generations": UNBOUNDED} if budget else None,
+        budget=budget, stats=stats, sink=sink,
     )
-    return hist[-1][1]  # makespan after final event
+    trace = [{**r, "rep": rep} for r in sink.records]
+    return hist[-1][1], stats["evaluations"], time.process_time() - t0, trace, None  # after final event
 
 
 # ------------------------------------------------------------- TS helper
-def _ts_static_once(data: dict) -> int:
-    tmp = tempfile.NamedTemporaryFile(delete=False).name  # dummy csv path
-    return run_tabu_search(data, data["name"], tmp, 0)[0][2]
-
-
-def _ts_dynamic_once(data: dict, scen_id: int) -> int:
-    hist = simulate_ts_with_rescheduling(data, scenario_id=scen_id, max_time=100)
-    return hist[-1][1]
+# The TS baseline keeps tabu_search's defaults: fixed tenure 15, no frequency
+# memory (tabu_size=None, freq_weight=1.0 would enable the adaptive memory).
+def _ts_static_once(data: dict, budget: dict | None = None) -> Tuple[int, int, dict]:
+    params = {"max_iters": UNBOUNDED, **budget} if budget else {}
+    conv = Convergence()
+    res = tabu_search(data, **params, trace=conv)
+    return res["makespan"], res["evaluations"], conv.arrays()
+
+
+def _ts_dynamic_once(data: dict, scen_id: int, budget: dict | None = None,
+                     sink=None) -> Tuple[int, int]:
+    stats = {}
+    hist = simulate_ts_with_rescheduling(
+        data, scenario_id=scen_id, max_time=100,
+        ts_params={"max_iters": UNBOUNDED} if budget else None,
+        budget=budget, stats=stats, sink=sink,
+    )
+    return hist[-1][1], stats["evaluations"]
 
 
-def _one_ts_run(args: Tuple[dict, int, int]) -> int:
-    inst, sid, rep = args
+def _one_ts_run(args: Tuple[dict, int, int, dict | None]) -> Tuple[int, int, float, list, dict]:
+    """(makespan, evaluations, CPU seconds, trace records, convergence arrays) of one TS run."""
+    inst, sid, rep, budget = args
     # reseed per scenario+rep for genuine variability
     random.seed(sid * 1000 + rep)
     dat = copy.deepcopy(inst)
-    return _ts_static_once(dat) if sid == 0 else _ts_dynamic_once(dat, sid)
+    t0 = time.process_time()
+    sink = MemorySink()
+    if sid == 0:
+        mk, evals, conv = _ts_static_once(dat, budget)
+    else:
+        (mk, evals), conv = _ts_dynamic_once(dat, sid, budget, sink), None
+    trace = [{**r, "rep": rep} for r in sink.records]
+    return mk, evals, time.process_time() - t0, trace, conv
+
+
+def _report(name: str, runs: list) -> None:
+    mks = [r[0] for r in runs]
+    print(f"    {name:<7} avg={statistics.mean(mks):.2f} "
+          f"sd={statistics.pstdev(mks):.2f} "
+          f"evals={statistics.mean(r[1] for r in runs):.0f} "
+          f"cpu={statistics.mean(r[2] for r in runs):.2f}s")
 
 
 # --------------------------------------------------------------------------- #
+def _tasks(instances: list, budget: dict | None):
+    """(instance, scenario id, algorithm, rep, worker fn, args) for every run of the sweep."""
+    for inst in instances:
+        for sid in SCENARIOS.values():
+            for vname, hfun in HEURISTICS.items():
+                for rep in range(REPS):
+                    yield inst["name"], sid, vname, rep, _one_ga_run, (inst, sid, vname, hfun, budget, rep)
+            for rep in range(REPS):
+                yield inst["name"], sid, "TS", rep, _one_ts_run, (inst, sid, rep, budget)
+
+
+def _write_cell(sinks: dict, trace: TraceSink, inst_name: str, sid: int, alg: str, runs: list) -> None:
+    for mk, evals, cpu, steps, _ in runs:
+        sinks[sid].emit(dict(zip(COLUMNS, [inst_name, alg, mk, sid, evals, round(cpu, 3)])))
+        trace.emit_many(steps)
+    save_traces(os.path.join(CONV_DIR, f"{inst_name}_{SCEN_NAMES[sid].lower()}_{alg}.npz"),
+                [r[4] for r in runs])
+    _report(alg, runs)
+
+
+def _open_outputs():
+    os.makedirs(CONV_DIR, exist_ok=True)
+    sinks = {sid: CsvSink(f"results/results_{scen.lower()}.csv", COLUMNS, mode="w")
+             for scen, sid in SCENARIOS.items()}
+    # one trace for the whole sweep: every rescheduling step, written in batches
+    return sinks, TraceSink("results/trace.jsonl")
+
+
+def _collect(broker: Broker) -> None:
+    """Write the result CSVs and trace from a broker's finished tasks."""
+    state = broker.progress("main")
+    if state["pending"] or state["running"] or state["failed"]:
+        print(f"WARNING: incomplete sweep {state}")
+    cells: Dict[Tuple[str, int, str], list] = {}
+    for key, _, res in broker.results("main"):
+        inst_name, sid, alg, _ = key.split("|")
+        cells.setdefault((inst_name, int(sid), alg), []).append(res)
+    sinks, trace = _open_outputs()
+    last = None
+    for (inst_name, sid, alg), runs in cells.items():
+        if (inst_name, sid) != last:
+            print(f"▶ {inst_name} — Scenario: {SCEN_NAMES[sid]}")
+            last = (inst_name, sid)
+        _write_cell(sinks, trace, inst_name, sid, alg, runs)
+    for sink in sinks.values():
+        sink.close()
+    trace.close()
+
+
 def main() -> None:
+    ap = argparse.ArgumentParser(description="GA variants vs TS over all scenarios")
+    ap.add_argument("--evals", type=int, default=None,
+                    help="equal budget: schedule evaluations per run (per reschedule if dynamic)")
+    ap.add_argument("--seconds", type=float, default=None,
+                    help="equal budget: wall-clock seconds per run (per reschedule if dynamic)")
+    ap.add_argument("--mode", choices=["local", "publish", "worker", "collect"], default="local",
+                    help="local: process pool on this host; publish / worker / collect: "
+                         "distribute the runs through the --broker task queue")
+    ap.add_argument("--broker", default="results/broker.sqlite",
+                    help="SQLite task queue, on storage shared by all hosts")
+    ap.add_argument("--workers", type=int, default=os.cpu_count(),
+                    help="worker processes to start on this host (worker mode)")
+    a = ap.parse_args()
+    if a.mode == "worker":
+        spawn(a.broker, a.workers)
+        return
+    if a.mode == "collect":
+        _collect(Broker(a.broker))
+        return
+    budget = None
+    if a.evals is not None or a.seconds is not None:
+        budget = {"max_evals": a.evals, "time_limit": a.seconds}
+
     instances = load_instances("data.txt")
-    os.makedirs("results", exist_ok=True)
+    if a.mode == "publish":
+        os.makedirs(os.path.dirname(a.broker) or ".", exist_ok=True)
+        n = Broker(a.broker).publish("main", (
+            (f"{name}|{sid}|{alg}|{rep}", fn, args)
+            for name, sid, alg, rep, fn, args in _tasks(instances, budget)))
+        print(f"published {n} runs to {a.broker}")
+        return
 
-    writers, files = {}, {}
-    for scen, sid in SCENARIOS.items():
-        f = open(f"results/results_{scen.lower()}.csv", "w", newline="")
-        w = csv.writer(f)
-        w.writerow(["Instance", "Algorithm", "Makespan", "ScenarioID"])
-        writers[sid], files[sid] = w, f
+    sinks, trace = _open_outputs()
 
     for inst in instances:
         print(f"\n▶ Instance {inst['name']} — {inst['num_jobs']}×{inst['num_machines']}")
         for scen_name, sid in SCENARIOS.items():
             print(f"  Scenario: {scen_name}")
-            out_csv = writers[sid]
 
             # ---------- GA variants
             for vname, hfun in HEURISTICS.items():
-                args = [(inst, sid, vname, hfun)] * REPS
+                args = [(inst, sid, vname, hfun, budget, rep) for rep in range(REPS)]
                 with Pool() as pool:
-                    scores = pool.map(_one_ga_run, args)
-                for mk in scores:
-                    out_csv.writerow([inst["name"], vname, mk, sid])
-                print(f"    {vname:<7} avg={statistics.mean(scores):.2f} "
-                      f"sd={statistics.pstdev(scores):.2f}")
+                    runs = pool.map(_one_ga_run, args)
+                _write_cell(sinks, trace, inst["name"], sid, vname, runs)
 
             # ---------- TS baseline (seeded per rep)
-            ts_args = [(inst, sid, rep) for rep in range(REPS)]
+            ts_args = [(inst, sid, rep, budget) for rep in range(REPS)]
             with Pool() as pool:
-                ts_scores = pool.map(_one_ts_run, ts_args)
-            for mk in ts_scores:
-                out_csv.writerow([inst["name"], "TS", mk, sid])
-            print(f"    TS      avg={statistics.mean(ts_scores):.2f} "
-                  f"sd={statistics.pstdev(ts_scores):.2f}")
-
-    for f in files.values():
-        f.close()
+                ts_runs = pool.map(_one_ts_run, ts_args)
+            _write_cell(sinks, trace, inst["name"], sid, "TS", ts_runs)
+
+    for sink in sinks.values():
+        sink.close()
+    trace.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,80 @@
+from __future__ import annotations
+import argparse, cProfile, pstats, time
+from copy import deepcopy
+from typing import Any, Dict, List
+
+from loader import load_instances
+from heuristics import HEURISTICS
+from scenario import apply_scenario
+from scheduler import Scheduler
+from rescheduler import build_agenda, dispatch_step, ga_step, ts_step
+from sinks import read_trace
+
+# Re-execute rescheduling steps from a trace written by main.py (or any
+# simulator given a sink):
+#
+#   python replay.py results/trace.jsonl --instance la30 --variant GASPT --scenario 2 --time 15
+#   python replay.py results/trace.jsonl --index 42 --profile
+#
+# The shop state is rebuilt by applying the first `applied` agenda entries of
+# the scenario; the recorded machine status, seed and parameters are reused,
+# so the makespan matches the trace (unless the step ran on a time budget).
+FILTERS = ("instance", "variant", "scenario", "rep", "time", "event")
+
+
+def replay_step(rec: Dict[str, Any], instances: Dict[str, dict]) -> Dict[str, Any]:
+    """Repeat one traced step; returns makespan, seconds and whether it matches."""
+    scen = apply_scenario(deepcopy(instances[rec["instance"]]), rec["scenario"])
+    for _, fn, _ in build_agenda(scen)[:rec["applied"]]:
+        fn()
+    ms = rec["machine_status"]
+    m_stat = None if ms is None else {int(m): v for m, v in ms.items()}
+    t0 = time.perf_counter()
+    if rec["solver"] == "DR":
+        _, mk = dispatch_step(scen, rec["params"], m_stat)
+    elif rec["solver"] == "TS":
+        _, mk = ts_step(scen, rec["params"], m_stat, rec["seed"], rec["budget"])
+    else:
+        sched = Scheduler(scen["num_machines"], use_cache=True)
+        _, mk = ga_step(scen, rec["params"], HEURISTICS[rec["variant"]], sched,
+                         m_stat, rec["seed"], rec["budget"])
+    return {"makespan": mk, "seconds": time.perf_counter() - t0, "match": mk == rec["makespan"]}
+
+
+def select(trace: List[dict], index: int | None = None, **filters) -> List[dict]:
+    if index is not None:
+        return [trace[index]]
+    return [r for r in trace
+            if all(v is None or str(r.get(k)).lower() == str(v).lower() for k, v in filters.items())]
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Deterministic replay of traced rescheduling steps")
+    ap.add_argument("trace")
+    ap.add_argument("--data", default="data.txt")
+    ap.add_argument("--index", type=int, default=None, help="line number in the trace (0-based)")
+    for k in FILTERS:
+        ap.add_argument(f"--{k}", default=None)
+    ap.add_argument("--profile", action="store_true", help="run each step under cProfile")
+    a = ap.parse_args()
+
+    instances = {i["name"]: i for i in load_instances(a.data)}
+    steps = select(read_trace(a.trace), a.index, **{k: getattr(a, k) for k in FILTERS})
+    print(f"{len(steps)} step(s) selected")
+    for rec in steps:
+        prof = cProfile.Profile() if a.profile else None
+        if prof:
+            prof.enable()
+        out = replay_step(rec, instances)
+        if prof:
+            prof.disable()
+        print(f"  {rec['instance']} {rec['variant']} sc{rec['scenario']} rep={rec.get('rep')} "
+              f"t={rec['time']} {rec['event']}: traced {rec['makespan']} ({rec['seconds']:.2f}s) "
+              f"replayed {out['makespan']} ({out['seconds']:.2f}s) "
+              f"{'OK' if out['match'] else 'MISMATCH'}")
+        if prof:
+            pstats.Stats(prof).sort_stats("cumulative").print_stats(25)
+
+
+if __name__ == "__main__":
+    main()
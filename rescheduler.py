@@ -1,83 +1,199 @@
 from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
-import csv, os, random, tempfile
-from typing import Dict, List, Tuple, Any
+import asyncio, random, time
+from typing import Callable, Dict, List, Tuple, Any
 
-from tabu       import run_tabu_search
+import numpy as np
+
+from tabu       import tabu_search
 from ga         import GeneticAlgorithm
 from scheduler  import Scheduler
+from dispatch   import dispatch
+from encoding   import repair
 from scenario   import apply_scenario
 
-def _append_job(data: Dict[str, Any]) -> None:
+def append_job(data: Dict[str, Any]) -> None:
     data["jobs"].append([(0, 3), (2, 5), (1, 4)])
     data["num_jobs"] += 1
 
+# --------------------------------------------------------------------------- #
+#  Agenda, machine status and event coalescing                                #
+# --------------------------------------------------------------------------- #
+def build_agenda(scen: Dict[str, Any]) -> List[Tuple[int, Callable[[], None], str]]:
+    agenda: List[Tuple[int, Callable[[], None], str]] = []
+    if "arrival_time" in scen:
+        agenda.append((scen["arrival_time"], lambda d=scen: append_job(d), "job_arrival"))
+    if "breakdowns" in scen:
+        for br in scen["breakdowns"]:
+            t, dur, m = br["start"], br["duration"], br["machine"]
+            agenda.append((t,     lambda d=scen, mm=m: d.setdefault("_broken", set()).add(mm), f"br_start_m{m}"))
+            agenda.append((t+dur, lambda d=scen, mm=m: d["_broken"].remove(mm),                 f"br_end_m{m}"))
+    agenda.sort(key=lambda x: x[0])
+    return agenda
+
+def _machine_status(scen: Dict[str, Any]) -> Dict[int, Any]:
+    m_stat: Dict[int,Any] = {}
+    if scen.get("processing_noise"):
+        fac = 1.1 + random.random()*0.1
+        for mm in range(scen["num_machines"]):
+            m_stat[mm] = fac
+    if "_broken" in scen:
+        for mm in scen["_broken"]:
+            m_stat[mm] = "broken"
+    return m_stat
+
+def _urgent(preempt, current: Dict[str, Any], num_machines: int) -> Callable[[str], bool] | None:
+    """
+    Preemption rule for _batches: which agenda tags close a window at once.
+      "breakdown" – any breakdown start
+      "critical"  – breakdown of the machine finishing last in the current schedule
+      "loaded"    – breakdown of the machine with most work in the current schedule
+      callable    – preempt(tag, current_ops) -> bool
+    """
+    if preempt is None:
+        return None
+    def urgent(tag: str) -> bool:
+        if callable(preempt):
+            return bool(preempt(tag, current.get("ops")))
+        if not tag.startswith("br_start_m"):
+            return False
+        if preempt == "breakdown" or not current.get("ops"):
+            return True
+        tl = Scheduler(num_machines).timeline(current["ops"])
+        if preempt == "critical":
+            hot = int(tl.machine[np.argmax(tl.finish)])
+        else:
+            hot = int(np.argmax(np.bincount(tl.machine, tl.finish - tl.start, minlength=num_machines)))
+        return int(tag[len("br_start_m"):]) == hot
+    return urgent
+
+def _batches(agenda, max_time: int, policy: Dict[str, Any] | None = None, urgent=None):
+    """
+    Yield (clk, [fn], [tag]) per reoptimisation. Without a policy every agenda
+    entry is its own batch; otherwise entries merge while
+      • they fall within policy["window"] of the batch's first entry, or
+      • they arrive before the previous optimisation, which takes
+        policy["busy"] time units, has finished (clk is then its end),
+    unless urgent(tag) closes the batch at that entry. clk never passes
+    max_time: a batch delayed beyond the horizon is optimised at max_time.
+    """
+    window = (policy or {}).get("window", 0)
+    busy = (policy or {}).get("busy", 0)
+    batch: List[Tuple[int, Callable[[], None], str]] = []
+    free = end = 0
+    for entry in agenda:
+        if entry[0] > max_time:
+            break
+        if batch and (policy is None or entry[0] > end):
+            clk = min(max(batch[-1][0], free), max_time)
+            yield clk, [e[1] for e in batch], [e[2] for e in batch]
+            free, batch = clk + busy, []
+        if not batch:
+            end = max(entry[0] + window, free)
+        batch.append(entry)
+        if urgent is not None and urgent(entry[2]):
+            clk = min(max(entry[0], free), max_time)
+            yield clk, [e[1] for e in batch], [e[2] for e in batch]
+            free, batch = clk + busy, []
+    if batch:
+        clk = min(max(batch[-1][0], free), max_time)
+        yield clk, [e[1] for e in batch], [e[2] for e in batch]
+
+def _coalesce_report(report: Dict[str, Any] | None, n_events: int, n_opt: int) -> None:
+    if report is not None:
+        report.update({"events": n_events, "optimisations": n_opt, "saved": n_events - n_opt})
+
+# --------------------------------------------------------------------------- #
+#  One reoptimisation step (shared with replay.py)                            #
+# --------------------------------------------------------------------------- #
+def ga_step(scen, params, heuristic_func, sched, m_stat, seed, budget=None):
+    """
+    GA reoptimisation with the global RNG and the GA seeded from `seed`, so a
+    traced step can be repeated exactly. Returns (op_seq, makespan under m_stat).
+    """
+    random.seed(seed)
+    ga = GeneticAlgorithm(scen, **{"rng_seed": seed, **params})
+    sched.set_budget(**(budget or {}))
+    best, _ = ga.run(scen, sched, heuristic_func)
+    sched.set_budget()
+    op_seq = ga._decode(best, scen)
+    return op_seq, Scheduler(scen["num_machines"]).calculate_makespan(op_seq, machine_status=m_stat)
+
+def ts_step(scen, params, m_stat, seed, budget=None, stats=None):
+    """TS counterpart of ga_step."""
+    random.seed(seed)
+    res = tabu_search(scen, machine_status=m_stat, **(budget or {}), **params)
+    if stats is not None:
+        stats["evaluations"] = res["evaluations"]
+    return res["ops"], res["makespan"]
+
+def dispatch_step(scen, params, m_stat):
+    """Dispatching-rule counterpart of ga_step (deterministic, no seed)."""
+    res = dispatch(scen, machine_status=m_stat, **params)
+    return res["ops"], res["makespan"]
+
+def _trace(sink, **rec) -> None:
+    """Emit one step record (machine_status keys as strings, for JSON)."""
+    if sink is not None:
+        ms = rec["machine_status"]
+        rec["machine_status"] = None if ms is None else {str(m): v for m, v in ms.items()}
+        sink.emit(rec)
+
 def simulate_ts_with_rescheduling(
     instance_data: Dict[str, Any],
     scenario_id  : int,
-    max_time     : int = 100
+    max_time     : int = 100,
+    ts_params    : Dict[str, Any] | None = None,
+    budget       : Dict[str, Any] | None = None,
+    stats        : Dict[str, Any] | None = None,
+    coalesce     : Dict[str, Any] | None = None,
+    report       : Dict[str, Any] | None = None,
+    sink                       = None
 ) -> List[Tuple[int,int]]:
+    """
+    budget: per-reschedule {"max_evals": n, "time_limit": s} for the search;
+    stats: optional dict, receives the total "evaluations" over all steps.
+    coalesce: {"window": t, "busy": t, "preempt": rule} merges agenda entries
+    into one reoptimisation (see _batches / _urgent); report receives
+    {"events", "optimisations", "saved"}.
+    sink: receives one record per reoptimisation (event, time, machine status,
+    seed, parameters, makespan, seconds); replay.py repeats any of them.
+    """
+    if stats is not None:
+        stats["evaluations"] = 0
     inst_copy = deepcopy(instance_data)
     scen      = apply_scenario(inst_copy, scenario_id)
-    sched     = Scheduler(scen["num_machines"], use_cache=True)
+    current: Dict[str, Any] = {}
+    params    = dict(ts_params or {})
+    n_events  = 0
 
-    # build events
-    events: List[Tuple[int, callable[[],None]]] = []
-    if "arrival_time" in scen:
-        events.append((scen["arrival_time"], lambda d=scen: _append_job(d)))
-    if "breakdowns" in scen:
-        for br in scen["breakdowns"]:
-            t, dur, m = br["start"], br["duration"], br["machine"]
-            events.append((t,     lambda d=scen, mm=m: d.setdefault("_broken", set()).add(mm)))
-            events.append((t+dur, lambda d=scen, mm=m: d["_broken"].remove(mm)))
-    events.sort(key=lambda x: x[0])
-
-    def _run_tabu(machine_status: Dict[int,Any] | None = None) -> int:
-        tmp_csv = tempfile.NamedTemporaryFile(delete=False).name
-        res     = run_tabu_search(
-            scen, scen["name"], tmp_csv, scenario_id,
-            machine_status=machine_status
-        )[0]
-        best_mk = res[2]
-        if len(res) > 4 and res[4] is not None:
-            seq = res[4]
-            # already decoded?
-            if seq and isinstance(seq[0], tuple) and isinstance(seq[0][1], tuple):
-                op_seq = seq
-            else:
-                op_seq = GeneticAlgorithm(scen)._decode(seq, scen)
-            best_mk = sched.calculate_makespan(op_seq, machine_status=machine_status)
+    def _run_tabu(clk: int, tag: str, machine_status: Dict[int,Any] | None = None) -> int:
+        seed, step, t0 = random.getrandbits(32), {}, time.perf_counter()
+        current["ops"], best_mk = ts_step(scen, params, machine_status,
+                                           seed, budget, step)
+        if stats is not None:
+            stats["evaluations"] += step["evaluations"]
+        _trace(sink, solver="TS", instance=instance_data["name"], variant="TS",
+               scenario=scenario_id, time=clk, event=tag, applied=n_events,
+               machine_status=machine_status, seed=seed, params=params, budget=budget,
+               makespan=best_mk, seconds=time.perf_counter() - t0)
         return best_mk
 
     history: List[Tuple[int,int]] = []
     clk = 0
-    history.append((0, _run_tabu(None)))
+    history.append((0, _run_tabu(0, "initial", None)))
 
-    for t, apply_evt in events:
-        if t > max_time:
-            break
-        clk = t
-        apply_evt()
-        m_stat: Dict[int,Any] = {}
-        if scen.get("processing_noise"):
-            fac = 1.1 + random.random()*0.1
-            for mm in range(scen["num_machines"]):
-                m_stat[mm] = fac
-        if "_broken" in scen:
-            for mm in scen["_broken"]:
-                m_stat[mm] = "broken"
-        history.append((clk, _run_tabu(m_stat)))
+    urgent = _urgent((coalesce or {}).get("preempt"), current, scen["num_machines"])
+    for clk, fns, tags in _batches(build_agenda(scen), max_time, coalesce, urgent):
+        for fn in fns:
+            fn()
+        n_events += len(fns)
+        history.append((clk, _run_tabu(clk, "+".join(tags), _machine_status(scen))))
+    _coalesce_report(report, n_events, len(history) - 1)
 
     if clk < max_time:
-        m_stat = {}
-        if scen.get("processing_noise"):
-            fac = 1.1 + random.random()*0.1
-            for mm in range(scen["num_machines"]):
-                m_stat[mm] = fac
-        if "_broken" in scen:
-            for mm in scen["_broken"]:
-                m_stat[mm] = "broken"
-        history.append((max_time, _run_tabu(m_stat)))
+        history.append((max_time, _run_tabu(max_time, "finish", _machine_status(scen))))
 
     return history
 
@@ -87,61 +203,207 @@ def simulate_with_rescheduling(
     scenario_id   : int,
     variant_name  : str,
     heuristic_func,
-    max_time      : int = 100
+    max_time      : int = 100,
+    ga_params     : Dict[str, Any] | None = None,
+    budget        : Dict[str, Any] | None = None,
+    stats         : Dict[str, Any] | None = None,
+    coalesce      : Dict[str, Any] | None = None,
+    report        : Dict[str, Any] | None = None,
+    sink                        = None
 ) -> List[Tuple[int,int]]:
+    """
+    budget: per-reschedule {"max_evals": n, "time_limit": s} for the GA;
+    stats: optional dict, receives the total "evaluations" over all steps.
+    coalesce / report / sink: as in simulate_ts_with_rescheduling.
+    """
+    if stats is not None:
+        stats["evaluations"] = 0
     inst_copy    = deepcopy(instance_data)
     scen         = apply_scenario(inst_copy, scenario_id)
     sched_default = Scheduler(scen["num_machines"], use_cache=True)
-
-    # build agenda
-    agenda: List[Tuple[int, callable[[],None], str]] = []
-    if "arrival_time" in scen:
-        agenda.append((scen["arrival_time"], lambda d=scen: _append_job(d), "job_arrival"))
-    if "breakdowns" in scen:
-        for br in scen["breakdowns"]:
-            t, dur, m = br["start"], br["duration"], br["machine"]
-            agenda.append((t,     lambda d=scen, mm=m: d.setdefault("_broken", set()).add(mm), f"br_start_m{m}"))
-            agenda.append((t+dur, lambda d=scen, mm=m: d["_broken"].remove(mm),                 f"br_end_m{m}"))
-    agenda.sort(key=lambda x: x[0])
-    it = iter(agenda)
-    next_evt = next(it, None)
-
-    # prepare log
-    os.makedirs("logs", exist_ok=True)
-    log_path = f"logs/{instance_data['name']}_{variant_name}_sc{scenario_id}.csv"
-    writer   = csv.writer(open(log_path, "w", newline=""))
-    writer.writerow(["time","variant","instance","makespan","event"])
+    current: Dict[str, Any] = {}
+    params = {"pop_size": 60, "num_generations": 120, "local_search_swaps": 15,
+              **(ga_params or {})}
+    n_events = 0
 
     def _run_ga(clk: int, tag: str) -> int:
-        m_stat: Dict[int,Any] = {}
-        if scen.get("processing_noise"):
-            fac = 1.1 + random.random()*0.1
-            for mm in range(scen["num_machines"]):
-                m_stat[mm] = fac
-        if "_broken" in scen:
-            for mm in scen["_broken"]:
-                m_stat[mm] = "broken"
-
-        ga = GeneticAlgorithm(scen, pop_size=60, num_generations=120, local_search_swaps=15)
-        best, _ = ga.run(scen, sched_default, heuristic_func)
-        op_seq = ga._decode(best, scen)
-        mk = sched_default.calculate_makespan(op_seq, machine_status=m_stat)
-        writer.writerow([clk, variant_name, instance_data["name"], mk, tag])
+        m_stat = _machine_status(scen)
+        seed, t0 = random.getrandbits(32), time.perf_counter()
+        n0 = sched_default.evaluations
+        current["ops"], mk = ga_step(scen, params, heuristic_func, sched_default,
+                                      m_stat, seed, budget)
+        if stats is not None:
+            stats["evaluations"] += sched_default.evaluations - n0
+        _trace(sink, solver="GA", instance=instance_data["name"], variant=variant_name,
+               scenario=scenario_id, time=clk, event=tag, applied=n_events,
+               machine_status=m_stat, seed=seed, params={"rng_seed": seed, **params},
+               budget=budget, makespan=mk, seconds=time.perf_counter() - t0)
         return mk
 
     history: List[Tuple[int,int]] = []
     clk = 0
     history.append((0, _run_ga(0, "initial")))
 
-    while next_evt and next_evt[0] <= max_time:
-        t, fn, tag = next_evt
-        clk = t
-        fn()
-        history.append((clk, _run_ga(clk, tag)))
-        next_evt = next(it, None)
+    urgent = _urgent((coalesce or {}).get("preempt"), current, scen["num_machines"])
+    for clk, fns, tags in _batches(build_agenda(scen), max_time, coalesce, urgent):
+        for fn in fns:
+            fn()
+        n_events += len(fns)
+        history.append((clk, _run_ga(clk, "+".join(tags))))
+    _coalesce_report(report, n_events, len(history) - 1)
 
     if clk < max_time:
         clk = max_time
         history.append((clk, _run_ga(clk, "finish")))
 
     return history
+
+
+def simulate_dispatch_with_rescheduling(
+    instance_data: Dict[str, Any],
+    scenario_id  : int,
+    rule                       = "MWKR",
+    max_time     : int = 100,
+    dr_params    : Dict[str, Any] | None = None,
+    coalesce     : Dict[str, Any] | None = None,
+    report       : Dict[str, Any] | None = None,
+    sink                       = None
+) -> List[Tuple[int,int]]:
+    """
+    Priority dispatching (see dispatch.py) instead of search on every event:
+    a sub-millisecond baseline, and a fallback where a GA / TS step is too
+    slow. rule: a dispatch rule name, {rule: weight} composite or key callable
+    (not with a JSON trace sink);
+    dr_params: further dispatch() arguments (due, due_factor, ...);
+    coalesce / report / sink: as in simulate_ts_with_rescheduling.
+    """
+    scen    = apply_scenario(deepcopy(instance_data), scenario_id)
+    current: Dict[str, Any] = {}
+    params  = {"rule": rule, **(dr_params or {})}
+    n_events = 0
+
+    def _run_dr(clk: int, tag: str) -> int:
+        m_stat, t0 = _machine_status(scen), time.perf_counter()
+        current["ops"], mk = dispatch_step(scen, params, m_stat)
+        _trace(sink, solver="DR", instance=instance_data["name"],
+               variant=rule if isinstance(rule, str) else "DR",
+               scenario=scenario_id, time=clk, event=tag, applied=n_events,
+               machine_status=m_stat, seed=None, params=params, budget=None,
+               makespan=mk, seconds=time.perf_counter() - t0)
+        return mk
+
+    history: List[Tuple[int,int]] = []
+    clk = 0
+    history.append((0, _run_dr(0, "initial")))
+
+    urgent = _urgent((coalesce or {}).get("preempt"), current, scen["num_machines"])
+    for clk, fns, tags in _batches(build_agenda(scen), max_time, coalesce, urgent):
+        for fn in fns:
+            fn()
+        n_events += len(fns)
+        history.append((clk, _run_dr(clk, "+".join(tags))))
+    _coalesce_report(report, n_events, len(history) - 1)
+
+    if clk < max_time:
+        history.append((max_time, _run_dr(max_time, "finish")))
+
+    return history
+
+
+# --------------------------------------------------------------------------- #
+#  Anytime rescheduling: immediate repair, background GA until the deadline   #
+# --------------------------------------------------------------------------- #
+def _ga_chunk(args):
+    """
+    Worker: continue a GA from `seeds` for at most `seconds`; (best, pop), with
+    `seeds` kept as the population if not even one generation fitted.
+    """
+    data, params, heuristic_func, seeds, seconds = args
+    ga = GeneticAlgorithm(data, **params)
+    sched = Scheduler(data["num_machines"], use_cache=True, time_limit=seconds)
+    best, _ = ga.run(data, sched, heuristic_func, seeds=seeds)
+    return best, seeds if ga.fit is None else ga.pop
+
+async def _anytime_step(executor, scen, seeds, m_stat, heuristic_func, params,
+                        deadline, interval, publish) -> dict:
+    """
+    Publish the repaired incumbent (seeds[0]) at once, then keep improving it
+    with GA chunks of at most `interval` s in `executor` until `deadline` s.
+    """
+    t0 = time.perf_counter()
+    sched = Scheduler(scen["num_machines"])
+    best = seeds[0]
+    mk = first_mk = sched.calculate_makespan(GeneticAlgorithm._decode(best, scen), machine_status=m_stat)
+    t_first = t_final = time.perf_counter() - t0
+    publish(best, mk, t_first)
+    loop, n_pub = asyncio.get_running_loop(), 1
+    while (left := deadline - (time.perf_counter() - t0)) > 0:
+        cand, seeds = await loop.run_in_executor(
+            executor, _ga_chunk, (scen, params, heuristic_func, seeds, min(interval, left)))
+        cmk = sched.calculate_makespan(GeneticAlgorithm._decode(cand, scen), machine_status=m_stat)
+        if cmk < mk:
+            best, mk, t_final = cand, cmk, time.perf_counter() - t0
+            publish(best, mk, t_final)
+            n_pub += 1
+    return {"best": best, "population": seeds, "first_mk": first_mk, "final_mk": mk,
+            "time_to_first": t_first, "time_to_final": t_final, "published": n_pub}
+
+async def _simulate_anytime(instance_data, scenario_id, heuristic_func, max_time,
+                            ga_params, deadline, interval, on_publish, report):
+    scen = apply_scenario(deepcopy(instance_data), scenario_id)
+    params = {"pop_size": 60, "num_generations": 120, "local_search_swaps": 15,
+              **(ga_params or {})}
+    history: List[Tuple[int,int]] = []
+    pop, clk = None, 0
+
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        async def step(clk: int, tag: str) -> None:
+            nonlocal pop
+            if pop is None:                     # nothing committed yet
+                first = heuristic_func(scen) if heuristic_func else repair([], scen)
+                seeds = np.array([repair(first, scen)])
+            else:                               # repair the warm population
+                seeds = np.array([repair(r, scen) for r in pop])
+            publish = lambda seq, mk, t: on_publish and on_publish(clk, tag, seq, mk, t)
+            res = await _anytime_step(executor, scen, seeds, _machine_status(scen),
+                                      heuristic_func, params, deadline, interval, publish)
+            pop = res.pop("population")
+            pop = np.vstack([[res["best"]], pop])[:len(pop)]    # commit the step's best
+            history.append((clk, res["final_mk"]))
+            if report is not None:
+                report.append({"time": clk, "event": tag, **{k: v for k, v in res.items() if k != "best"}})
+
+        await step(0, "initial")
+        for t, fn, tag in build_agenda(scen):
+            if t > max_time:
+                break
+            clk = t
+            fn()
+            await step(clk, tag)
+        if clk < max_time:
+            await step(max_time, "finish")
+    return history
+
+def simulate_anytime_rescheduling(
+    instance_data : Dict[str, Any],
+    scenario_id   : int,
+    heuristic_func = None,
+    max_time      : int = 100,
+    ga_params     : Dict[str, Any] | None = None,
+    deadline      : float = 1.0,
+    interval      : float = 0.25,
+    on_publish    : Callable | None = None,
+    report        : List[dict] | None = None
+) -> List[Tuple[int,int]]:
+    """
+    Latency-bounded variant of simulate_with_rescheduling. On every event the
+    current schedule is repaired for the new instance (surplus genes dropped,
+    a new job's genes appended) and published immediately; a GA warm-started
+    from the repaired population then runs in a background process in chunks
+    of `interval` s, publishing each better schedule, until `deadline` s.
+      • on_publish(clk, event, sequence, makespan, seconds) – called per publication
+      • report – receives per event: first_mk, final_mk, time_to_first,
+                 time_to_final, published
+    """
+    return asyncio.run(_simulate_anytime(instance_data, scenario_id, heuristic_func, max_time,
+                                         ga_params, deadline, interval, on_publish, report))
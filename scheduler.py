@@ -1,23 +1,113 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, NamedTuple, Tuple, Optional
+import math, time
+import numpy as np
 
 # ((job-id, op-idx), (machine, duration))
 Operation = Tuple[Tuple[int, int], Tuple[int, int]]
 
+
+class Timeline(NamedTuple):
+    """Structure-of-arrays view of a decoded schedule, in chromosome order."""
+    start: np.ndarray
+    finish: np.ndarray
+    machine: np.ndarray
+    job: np.ndarray
+    op: np.ndarray
+    makespan: int
+
+
+METRICS = ("makespan", "flow_time", "tardiness", "utilisation", "deviation")
+
+
+class Metrics(NamedTuple):
+    """Result of Scheduler.evaluate; metrics that were not requested stay None."""
+    makespan: int
+    flow_time: Optional[int] = None        # Σ job completion times
+    tardiness: Optional[int] = None        # Σ max(0, C_j - d_j)
+    utilisation: Optional[float] = None    # busy time / (machines × Cmax)
+    deviation: Optional[int] = None        # Σ |start - reference start|
+
+
+class Scenarios(NamedTuple):
+    """Sampled realisations for Scheduler.makespans, keyed by operation (not position)."""
+    factor: np.ndarray      # (n_ops, S) duration multiplier, row offset[job] + op
+    br_start: np.ndarray    # (machines, S) breakdown window start (inf: no breakdown)
+    br_end: np.ndarray      # (machines, S) breakdown window end
+    offset: np.ndarray      # (jobs,) first row of each job in `factor`
+
+
+class Robustness(NamedTuple):
+    """Makespan distribution of one schedule over sampled Scenarios."""
+    mean: float
+    std: float
+    quantiles: Dict[float, float]
+    var: float              # alpha-quantile (value at risk)
+    cvar: float             # mean of the worst (1 - alpha) share of samples
+    samples: np.ndarray
+
+
+class BudgetExhausted(Exception):
+    """Raised by calculate_makespan once the Scheduler's budget is spent."""
+
+
 class Scheduler:
     """Event-based JSSP simulator with optional machine‐state modifiers."""
-    __slots__ = ("num_machines", "_cache")
+    __slots__ = ("num_machines", "_cache", "evaluations", "_max_evals", "_deadline", "_partial")
 
-    def __init__(self, num_machines: int, use_cache: bool = False) -> None:
+    def __init__(
+        self,
+        num_machines: int,
+        use_cache: bool = False,
+        max_evals: Optional[int] = None,
+        time_limit: Optional[float] = None
+    ) -> None:
         self.num_machines = num_machines
-        self._cache: Optional[Dict[Tuple[int, ...], int]] = {} if use_cache else None
+        self._cache: Optional[Dict[Tuple[int, ...] | int, int]] = {} if use_cache else None
+        self.evaluations = 0                # simulations charged by _charge, cache hits included
+        self._partial = 0.0                 # makespan_bound work, in evaluations
+        self.set_budget(max_evals, time_limit)
+
+    def set_budget(self, max_evals: Optional[int] = None, time_limit: Optional[float] = None) -> None:
+        """
+        Allow at most `max_evals` further evaluations and `time_limit` further
+        wall-clock seconds; beyond that calculate_makespan raises
+        BudgetExhausted. Both None lifts the budget.
+        """
+        self._max_evals = None if max_evals is None else self.evaluations + max_evals
+        self._deadline = None if time_limit is None else time.perf_counter() + time_limit
+
+    def _charge(self) -> None:
+        """Count one evaluation, raising BudgetExhausted if none is left."""
+        if self._max_evals is not None and self.evaluations >= self._max_evals:
+            raise BudgetExhausted(f"{self._max_evals} evaluations")
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise BudgetExhausted("time limit")
+        self.evaluations += 1
+
+    @staticmethod
+    def duration(
+        dur: int,
+        status: str | float | None,
+        noise_factor: float = 1.2,
+        breakdown_penalty: int = 10**6
+    ) -> int:
+        """Processing time of a `dur` operation on a machine in `status` (see calculate_makespan)."""
+        if status == "broken":
+            return dur + breakdown_penalty
+        if status == "noisy":
+            return int(dur * noise_factor)
+        if isinstance(status, (int, float)):    # custom factor
+            return int(dur * status)
+        return dur
 
     def calculate_makespan(
         self,
         chromosome: List[Operation],
         machine_status: Optional[Dict[int, str | float]] = None,
         noise_factor: float = 1.2,          # default multiplier for “noisy” machines
-        breakdown_penalty: int = 10**6      # large delay for “broken” machines
+        breakdown_penalty: int = 10**6,     # large delay for “broken” machines
+        key: Optional[int] = None           # precomputed cache key, e.g. canonical_key()
     ) -> int:
         """
         machine_status[m] can be:
@@ -25,8 +115,13 @@ class Scheduler:
           • "noisy"   → task duration is multiplied by noise_factor
           • a float   → task duration is multiplied by that float (custom noise)
         """
+        self._charge()
+
         if self._cache is not None:
-            key = tuple(op[0] for op in chromosome)
+            if key is None:
+                key = tuple(op[0] for op in chromosome)
+            if machine_status:              # same order, other shop state: other entry
+                key = (key, tuple(sorted(machine_status.items())), noise_factor, breakdown_penalty)
             hit = self._cache.get(key)
             if hit is not None:
                 return hit
@@ -34,15 +129,10 @@ class Scheduler:
         m_ready = [0] * self.num_machines
         j_ready: Dict[int, int] = {}
 
+        status = machine_status or {}
         for (job_id, _), (mach, dur) in chromosome:
-            status = (machine_status or {}).get(mach)
-
-            if status == "broken":
-                dur += breakdown_penalty
-            elif status == "noisy":
-                dur = int(dur * noise_factor)
-            elif isinstance(status, (int, float)):      # custom factor
-                dur = int(dur * status)
+            if mach in status:
+                dur = self.duration(dur, status[mach], noise_factor, breakdown_penalty)
 
             start  = max(m_ready[mach], j_ready.get(job_id, 0))
             finish = start + dur
@@ -53,3 +143,209 @@ class Scheduler:
         if self._cache is not None:
             self._cache[key] = cmax
         return cmax
+
+    def canonical_key(self, chromosome: List[Operation]) -> int:
+        """
+        Hash of the per-machine job order. Chromosomes with equal keys decode
+        to the same semi-active schedule (and hence the same makespan).
+        """
+        per_m: List[List[int]] = [[] for _ in range(self.num_machines)]
+        for (job_id, _), (mach, _) in chromosome:
+            per_m[mach].append(job_id)
+        return hash(tuple(map(tuple, per_m)))
+
+    def makespan_bound(
+        self,
+        chromosome: List[Operation],
+        prefix: int,
+        job_work: List[int],
+        mach_work: List[int]
+    ) -> int:
+        """
+        Cheap lower bound on calculate_makespan(chromosome) (no machine_status):
+        simulate only the first `prefix` operations, then add the remaining
+        work of every job / machine to its ready time.
+          • job_work[j], mach_work[m] – total processing time of job j / machine m
+        Costs prefix / len(chromosome) of an evaluation; the running total is
+        charged rounded up, so bounds count against the budget too.
+        """
+        before = self._partial
+        self._partial += prefix / max(len(chromosome), 1)
+        for _ in range(math.ceil(self._partial) - math.ceil(before)):
+            self._charge()
+        m_ready = [0] * self.num_machines
+        j_ready = [0] * len(job_work)
+        j_rem, m_rem = list(job_work), list(mach_work)
+
+        for (job_id, _), (mach, dur) in chromosome[:prefix]:
+            start = max(m_ready[mach], j_ready[job_id])
+            m_ready[mach] = j_ready[job_id] = start + dur
+            j_rem[job_id] -= dur
+            m_rem[mach]   -= dur
+
+        return max(max(map(sum, zip(j_ready, j_rem))), max(map(sum, zip(m_ready, m_rem))))
+
+    def timeline(
+        self,
+        chromosome: List[Operation],
+        machine_status: Optional[Dict[int, str | float]] = None,
+        noise_factor: float = 1.2,
+        breakdown_penalty: int = 10**6
+    ) -> Timeline:
+        """
+        Same simulation as calculate_makespan (uncached, one evaluation),
+        additionally recording start and finish of every operation in
+        chromosome order.
+        """
+        self._charge()
+        starts: List[int] = []
+        finishes: List[int] = []
+        m_ready = [0] * self.num_machines
+        j_ready: Dict[int, int] = {}
+
+        status = machine_status or {}
+        for (job_id, _), (mach, dur) in chromosome:
+            if mach in status:
+                dur = self.duration(dur, status[mach], noise_factor, breakdown_penalty)
+
+            start  = max(m_ready[mach], j_ready.get(job_id, 0))
+            finish = start + dur
+            m_ready[mach] = finish
+            j_ready[job_id] = finish
+            starts.append(start)
+            finishes.append(finish)
+
+        ids = np.array([(j, o, m) for (j, o), (m, _) in chromosome],
+                       dtype=np.int32).reshape(-1, 3)
+        return Timeline(np.array(starts, dtype=np.int64), np.array(finishes, dtype=np.int64),
+                        ids[:, 2], ids[:, 0], ids[:, 1], max(m_ready))
+
+    def sample_scenarios(
+        self,
+        jobs: List[List[Tuple[int, int]]],
+        n_samples: int = 1000,
+        noise: Tuple[float, float] = (1.0, 1.2),
+        breakdown_prob: float = 0.0,
+        breakdown_duration: Tuple[int, int] = (5, 15),
+        horizon: Optional[float] = None,
+        rng: Optional[np.random.Generator] = None
+    ) -> Scenarios:
+        """
+        Draw `n_samples` realisations:
+          • noise              – per-operation duration factor ~ U(lo, hi)
+          • breakdown_prob     – chance per machine of one breakdown, starting
+                                 ~ U(0, horizon) (default: the largest machine
+                                 load) and lasting ~ U{breakdown_duration}
+        The same Scenarios can score many chromosomes (common random numbers).
+        """
+        rng = rng if rng is not None else np.random.default_rng()
+        lens = np.array([len(ops) for ops in jobs])
+        offset = np.concatenate(([0], np.cumsum(lens)[:-1]))
+        factor = rng.uniform(noise[0], noise[1], size=(int(lens.sum()), n_samples))
+        shape = (self.num_machines, n_samples)
+        if horizon is None:
+            load = np.zeros(self.num_machines)
+            for ops in jobs:
+                for m, d in ops:
+                    load[m] += d
+            horizon = load.max(initial=1.0)
+        br_start = np.where(rng.random(shape) < breakdown_prob,
+                            rng.uniform(0, horizon, size=shape), np.inf)
+        br_end = br_start + rng.integers(breakdown_duration[0], breakdown_duration[1] + 1, size=shape)
+        return Scenarios(factor, br_start, br_end, offset)
+
+    def makespans(self, chromosome: List[Operation], scenarios: Scenarios) -> np.ndarray:
+        """
+        Makespan of `chromosome` in every sampled scenario, all samples per
+        operation at once. Durations are floor(d × factor); an operation that
+        would overlap its machine's breakdown window starts after it instead.
+        One call is one evaluation against the budget.
+        """
+        self._charge()
+        S = scenarios.factor.shape[1]
+        m_ready = np.zeros((self.num_machines, S))
+        j_ready = np.zeros((len(scenarios.offset), S))
+        for (job_id, op), (mach, dur) in chromosome:
+            d = np.floor(dur * scenarios.factor[scenarios.offset[job_id] + op])
+            start = np.maximum(m_ready[mach], j_ready[job_id])
+            hit = (start < scenarios.br_end[mach]) & (start + d > scenarios.br_start[mach])
+            start = np.where(hit, scenarios.br_end[mach], start)
+            m_ready[mach] = j_ready[job_id] = start + d
+        return m_ready.max(axis=0)
+
+    def robustness(
+        self,
+        chromosome: List[Operation],
+        scenarios: Optional[Scenarios] = None,
+        jobs: Optional[List[List[Tuple[int, int]]]] = None,
+        quantiles: Tuple[float, ...] = (0.5, 0.9, 0.95),
+        alpha: float = 0.95,
+        **sample_kw: Any
+    ) -> Robustness:
+        """
+        Mean, std, quantiles, VaR and CVaR at `alpha` of the makespan over
+        `scenarios`, or over fresh ones sampled for `jobs` (sample_scenarios
+        keywords pass through).
+        """
+        if scenarios is None:
+            if jobs is None:
+                raise ValueError("robustness needs scenarios or jobs to sample them for")
+            scenarios = self.sample_scenarios(jobs, **sample_kw)
+        x = self.makespans(chromosome, scenarios)
+        tail = np.sort(x)[-max(1, int(np.ceil((1 - alpha) * len(x)))):]
+        return Robustness(
+            mean=float(x.mean()), std=float(x.std()),
+            quantiles={q: float(v) for q, v in zip(quantiles, np.quantile(x, quantiles))},
+            var=float(np.quantile(x, alpha)), cvar=float(tail.mean()), samples=x)
+
+    def evaluate(
+        self,
+        chromosome: List[Operation],
+        metrics: Tuple[str, ...] = ("makespan",),
+        machine_status: Optional[Dict[int, str | float]] = None,
+        due_dates: Optional[List[int]] = None,
+        reference: Optional[Timeline] = None,
+        noise_factor: float = 1.2,
+        breakdown_penalty: int = 10**6
+    ) -> Metrics:
+        """
+        Compute the requested metrics from a single simulation pass.
+          • due_dates  – per-job due date, required for "tardiness"
+          • reference  – Timeline of the pre-event schedule, required for
+                         "deviation" (only operations present in both count)
+        """
+        unknown = set(metrics) - set(METRICS)
+        if unknown:
+            raise ValueError(f"unknown metrics {sorted(unknown)}; choose from {METRICS}")
+        tl = self.timeline(chromosome, machine_status, noise_factor, breakdown_penalty)
+        out: Dict[str, Any] = {}
+
+        if "flow_time" in metrics or "tardiness" in metrics:
+            done = np.zeros(int(tl.job.max()) + 1 if len(tl.job) else 0, dtype=np.int64)
+            np.maximum.at(done, tl.job, tl.finish)
+            jobs = np.unique(tl.job)
+            if "flow_time" in metrics:
+                out["flow_time"] = int(done[jobs].sum())
+            if "tardiness" in metrics:
+                if due_dates is None:
+                    raise ValueError('"tardiness" needs due_dates')
+                due = np.asarray(due_dates, dtype=np.int64)[jobs]
+                out["tardiness"] = int(np.maximum(done[jobs] - due, 0).sum())
+
+        if "utilisation" in metrics:
+            busy = int((tl.finish - tl.start).sum())
+            out["utilisation"] = busy / (self.num_machines * tl.makespan) if tl.makespan else 0.0
+
+        if "deviation" in metrics:
+            if reference is None:
+                raise ValueError('"deviation" needs a reference timeline')
+            width = int(max(tl.op.max(initial=0), reference.op.max(initial=0))) + 1
+            ref_key = reference.job.astype(np.int64) * width + reference.op
+            order = np.argsort(ref_key)
+            ref_key, ref_start = ref_key[order], reference.start[order]
+            key = tl.job.astype(np.int64) * width + tl.op
+            pos = np.minimum(np.searchsorted(ref_key, key), max(len(ref_key) - 1, 0))
+            hit = (ref_key[pos] == key) if len(ref_key) else np.zeros(len(key), dtype=bool)
+            out["deviation"] = int(np.abs(tl.start[hit] - ref_start[pos[hit]]).sum())
+
+        return Metrics(makespan=tl.makespan, **out)
@@ -0,0 +1,202 @@
+from __future__ import annotations
+import argparse, asyncio, json, os, socket, time
+from copy import deepcopy
+from typing import Any, Dict, List
+
+import numpy as np
+
+from loader import load_instances
+from heuristics import HEURISTICS
+from ga import GeneticAlgorithm
+from scheduler import Scheduler
+from encoding import decode, random_solution, repair
+from rescheduler import append_job
+from tabu import walk, walk_start
+from dispatch import dispatch
+
+# Long-running rescheduling service: one JSON object per line in, one out.
+#
+#   {"op": "open",  "session": "s1", "instance": "la30", "solver": "GA",
+#                   "variant": "GASPT", "params": {...}}
+#        solvers: GA, TS, DR (priority dispatching, params {"rule": ...})
+#   {"op": "event", "session": "s1", "event": {"type": "breakdown", "machine": 2}}
+#        types: job_arrival [ops], breakdown / repair [machine], noise [factor]
+#   {"op": "schedule" | "close", "session": "s1"},   {"op": "ping"}
+#
+# Instances are parsed once at start-up; each session keeps its instance copy,
+# committed schedule and warm GA population / TS walk state.  Fitness caches
+# live for one reoptimisation, so a long-running session stays bounded.
+GA_DEFAULTS = {"pop_size": 60, "num_generations": 120, "local_search_swaps": 15}
+TS_DEFAULTS = {"max_iters": 250, "tabu_size": None, "freq_weight": 1.0}
+DR_DEFAULTS = {"rule": "MWKR"}
+DEFAULTS = {"GA": GA_DEFAULTS, "TS": TS_DEFAULTS, "DR": DR_DEFAULTS}
+
+
+class Session:
+    """Solver state of one shop between events."""
+
+    def __init__(self, data: dict, solver: str = "GA", variant: str = "GA",
+                 params: Dict[str, Any] | None = None) -> None:
+        if solver not in DEFAULTS:
+            raise ValueError(f"unknown solver {solver!r}")
+        self.data, self.solver = data, solver
+        self.heuristic = HEURISTICS[variant] if solver == "GA" else None
+        self.params = {**DEFAULTS[solver], **(params or {})}
+        self.broken: set = set()
+        self.noise: float | None = None
+        self.pop = None                     # GA: last population
+        self.walk: Dict[str, Any] | None = None   # TS: last walk state
+        self.best: List[int] = []
+        self.lock = asyncio.Lock()
+
+    def machine_status(self) -> Dict[int, Any]:
+        m_stat: Dict[int, Any] = {}
+        if self.noise:
+            m_stat = {m: self.noise for m in range(self.data["num_machines"])}
+        for m in self.broken:
+            m_stat[m] = "broken"
+        return m_stat
+
+    def apply(self, evt: Dict[str, Any]) -> None:
+        kind = evt["type"]
+        if kind == "job_arrival":
+            if "ops" in evt:
+                self.data["jobs"].append([tuple(op) for op in evt["ops"]])
+                self.data["num_jobs"] += 1
+            else:
+                append_job(self.data)
+        elif kind == "breakdown":
+            self.broken.add(int(evt["machine"]))
+        elif kind == "repair":
+            self.broken.discard(int(evt["machine"]))
+        elif kind == "noise":
+            self.noise = evt.get("factor")
+        else:
+            raise ValueError(f"unknown event type {kind!r}")
+
+    def optimise(self) -> Dict[str, Any]:
+        """Warm-started reoptimisation; runs in a worker thread."""
+        t0 = time.perf_counter()
+        m_stat = self.machine_status()
+        sched = Scheduler(self.data["num_machines"], use_cache=True)   # one event's cache
+        if self.solver == "GA":
+            seeds = None if self.pop is None else np.array([repair(r, self.data) for r in self.pop])
+            ga = GeneticAlgorithm(self.data, **self.params)
+            self.best, _ = ga.run(self.data, sched, self.heuristic, seeds=seeds)
+            self.pop = ga.pop
+        elif self.solver == "DR":
+            self.best = dispatch(self.data, machine_status=m_stat, **self.params)["sequence"]
+        else:
+            jobs = self.data["jobs"]
+            seq = repair(self.walk["best"], self.data) if self.walk else random_solution(jobs)
+            state = walk_start(jobs, sched, m_stat, seq)
+            if self.walk:                   # keep tabu and frequency memory
+                state.update(it=self.walk["it"], tabu=self.walk["tabu"], freq=self.walk["freq"])
+            self.walk = walk(jobs, sched, m_stat, state, self.params["max_iters"],
+                             self.params["tabu_size"], freq_weight=self.params["freq_weight"])
+            self.best = self.walk["best"]
+        return self.schedule(seconds=time.perf_counter() - t0)
+
+    def schedule(self, **extra) -> Dict[str, Any]:
+        ops = decode(self.best, self.data["jobs"])
+        mk = Scheduler(self.data["num_machines"]).calculate_makespan(
+            ops, machine_status=self.machine_status())
+        return {"makespan": mk, "sequence": [int(j) for j in self.best], **extra}
+
+
+class RescheduleService:
+    """asyncio JSON-lines server over a Unix socket or localhost TCP."""
+
+    def __init__(self, data_path: str = "data.txt") -> None:
+        self.instances = {i["name"].lower(): i for i in load_instances(data_path)}
+        self.sessions: Dict[str, Session] = {}
+
+    async def handle(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        op = msg.get("op")
+        if op == "ping":
+            return {"sessions": sorted(self.sessions)}
+        sid = msg["session"]
+        if op == "open":
+            inst = msg["instance"]
+            data = deepcopy(self.instances[inst.lower()] if isinstance(inst, str) else inst)
+            data.setdefault("num_jobs", len(data["jobs"]))
+            self.sessions[sid] = sess = Session(data, msg.get("solver", "GA"),
+                                                msg.get("variant", "GA"), msg.get("params"))
+            async with sess.lock:
+                return await asyncio.to_thread(sess.optimise)
+        sess = self.sessions[sid]
+        if op == "event":
+            async with sess.lock:
+                sess.apply(msg["event"])
+                return await asyncio.to_thread(sess.optimise)
+        if op == "schedule":
+            return sess.schedule()
+        if op == "close":
+            del self.sessions[sid]
+            return {}
+        raise ValueError(f"unknown op {op!r}")
+
+    async def _client(self, reader, writer) -> None:
+        while line := await reader.readline():
+            try:
+                out = {"ok": True, **await self.handle(json.loads(line))}
+            except Exception as e:          # report to the client, keep serving
+                out = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            writer.write((json.dumps(out) + "\n").encode())
+            await writer.drain()
+        writer.close()
+
+    async def serve(self, path: str | None = None, host: str = "127.0.0.1", port: int = 8765):
+        if path:
+            if os.path.exists(path):
+                os.remove(path)
+            server = await asyncio.start_unix_server(self._client, path)
+        else:
+            server = await asyncio.start_server(self._client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+class ServiceClient:
+    """Blocking client for RescheduleService (one request in flight)."""
+
+    def __init__(self, path: str | None = None, host: str = "127.0.0.1", port: int = 8765) -> None:
+        if path:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.connect(path)
+        else:
+            self.sock = socket.create_connection((host, port))
+        self.file = self.sock.makefile("rwb")
+
+    def request(self, **msg) -> Dict[str, Any]:
+        self.file.write((json.dumps(msg) + "\n").encode())
+        self.file.flush()
+        out = json.loads(self.file.readline())
+        if not out.pop("ok"):
+            raise RuntimeError(out["error"])
+        return out
+
+    def open(self, session: str, instance, **kw) -> Dict[str, Any]:
+        return self.request(op="open", session=session, instance=instance, **kw)
+
+    def event(self, session: str, type: str, **kw) -> Dict[str, Any]:
+        return self.request(op="event", session=session, event={"type": type, **kw})
+
+    def close(self) -> None:
+        self.file.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Local rescheduling service (JSON lines)")
+    ap.add_argument("--socket", default=None, help="Unix socket path (default: TCP)")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--data", default="data.txt")
+    a = ap.parse_args()
+    asyncio.run(RescheduleService(a.data).serve(a.socket, port=a.port))
@@ -0,0 +1,99 @@
+from __future__ import annotations
+import csv, json, os
+from typing import Any, Dict, Iterable, List
+
+# Record sinks: anything with emit(record) / flush() / close().  Solvers and
+# simulators only emit plain dicts; where they end up is the runner's choice.
+Record = Dict[str, Any]
+
+
+class MemorySink:
+    """Keeps records in a list, e.g. to hand them back from a worker process."""
+
+    def __init__(self) -> None:
+        self.records: List[Record] = []
+
+    def emit(self, record: Record) -> None:
+        self.records.append(record)
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class TraceSink:
+    """JSONL trace, one record per line, written in batches of `batch_size`."""
+
+    def __init__(self, path: str, batch_size: int = 1000, mode: str = "w") -> None:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._f = open(path, mode, encoding="utf-8")
+        self.batch_size = batch_size
+        self._buf: List[Record] = []
+
+    def emit(self, record: Record) -> None:
+        self._buf.append(record)
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def emit_many(self, records: Iterable[Record]) -> None:
+        self._buf.extend(records)
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buf:
+            self._f.write("".join(json.dumps(r) + "\n" for r in self._buf))
+            self._buf.clear()
+        self._f.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class CsvSink:
+    """CSV rows (columns `fields`, header on a new file), written in batches."""
+
+    def __init__(self, path: str, fields: List[str], batch_size: int = 1000,
+                 mode: str = "a") -> None:
+        new = mode == "w" or not os.path.exists(path) or os.path.getsize(path) == 0
+        self._f = open(path, mode, newline="", encoding="utf-8")
+        self._w = csv.DictWriter(self._f, fieldnames=fields, extrasaction="ignore")
+        if new:
+            self._w.writeheader()
+        self.batch_size = batch_size
+        self._buf: List[Record] = []
+
+    def emit(self, record: Record) -> None:
+        self._buf.append(record)
+        if len(self._buf) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        self._w.writerows(self._buf)
+        self._buf.clear()
+        self._f.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_trace(path: str) -> List[Record]:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
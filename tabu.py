@@ -1,90 +1,299 @@
 import random
 import csv
 from copy import deepcopy
-from scheduler import Scheduler
+from multiprocessing import Pool
+from scheduler import Scheduler, BudgetExhausted
+from checkpoint import clear_checkpoint, load_checkpoint, save_checkpoint
+from encoding import decode, random_solution
 
-def _random_solution(jobs):
-    """Create a random job‐based permutation (one entry per operation)."""
-    seq = [jid for jid, ops in enumerate(jobs) for _ in ops]
-    random.shuffle(seq)
-    return seq
+def walk_start(jobs, sched, machine_status, seq):
+    """Fresh walk state at `seq` (evaluated once)."""
+    ops = decode(seq, jobs)
+    mk = sched.calculate_makespan(ops, machine_status=machine_status)
+    return {"cur": seq, "cur_key": sched.canonical_key(ops),
+            "best": seq[:], "best_mk": mk,
+            "it": 0, "tabu": {}, "freq": {}}
 
-def _decode(sol, jobs):
+def _attribute(ops, i, j):
+    """Move attribute of swapping positions i, j: the two (job, op, machine) swapped."""
+    (a, ka), (ma, _) = ops[i]
+    (b, kb), (mb, _) = ops[j]
+    x, y = (a, ka, ma), (b, kb, mb)
+    return (x, y) if x < y else (y, x)
+
+def walk(jobs, sched, machine_status, state, iters, tabu_size=15,
+          rng=random, freq_weight=0.0, trace=None):
     """
-    Translate a job‐sequence (e.g. [0,2,1,0,2,1,…]) into an operation list
-    [ ((job_id, op_idx), (mach, dur)), … ] for the scheduler.
+    `iters` tabu iterations continuing from `state` (see walk_start), updated in
+    place so a walk can be resumed, or inspected after BudgetExhausted.
+    Tabu memory maps a move attribute (see _attribute) to the iteration it
+    expires at; tenure is `tabu_size`, or if None drawn per move from
+    [L, 3L/2] with L = 10 + n_jobs / n_machines. A tabu move is allowed if it
+    beats the best so far (aspiration); other moves are ranked by makespan
+    plus `freq_weight` × how often their attribute was chosen before.
+    `trace` (a convergence.Convergence) records the best after every iteration.
     """
-    idx = [0] * len(jobs)
-    out = []
-    for jid in sol:
-        m, t = jobs[jid][idx[jid]]
-        out.append(((jid, idx[jid]), (m, t)))
-        idx[jid] += 1
-    return out
+    cur, cur_key = state["cur"], state["cur_key"]
+    tabu, freq = state["tabu"], state["freq"]
+    base = 10 + len(jobs) // sched.num_machines
+    max_tenure = tabu_size or base * 3 // 2
+    for _ in range(iters):
+        it = state["it"] = state["it"] + 1
+        cur_ops = decode(cur, jobs)
+        # Generate neighbors by swapping two positions; swaps of equal job IDs
+        # are no-ops and are redrawn (bounded, so tiny instances still finish)
+        neighbors = []
+        for _ in range(10):
+            candidate = cur[:]
+            for _ in range(5):
+                i, j = rng.sample(range(len(candidate)), 2)
+                if candidate[i] != candidate[j]:
+                    break
+            candidate[i], candidate[j] = candidate[j], candidate[i]
+            neighbors.append((candidate, (i, j)))
 
-def run_tabu_search(
+        # Evaluate all neighbors under current machine_status, skipping those
+        # that decode to the current schedule (same per-machine order); the
+        # canonical key doubles as cache key so equivalent schedules hit
+        scored = []
+        for cand, (i, j) in neighbors:
+            ops = decode(cand, jobs)
+            key = sched.canonical_key(ops)
+            if key == cur_key:
+                continue
+            mk = sched.calculate_makespan(ops, machine_status=machine_status, key=key)
+            scored.append((mk, cand, _attribute(cur_ops, i, j), key))
+        scored.sort(key=lambda x: x[0])
+
+        # Pick the best admissible move
+        pick = None
+        for mk, cand, attr, key in scored:
+            if mk < state["best_mk"]:
+                score = mk                              # aspiration
+            elif tabu.get(attr, 0) > it:
+                continue
+            else:
+                score = mk + freq_weight * freq.get(attr, 0)
+            if pick is None or score < pick[0]:
+                pick = (score, mk, cand, attr, key)
+        if pick is None:
+            if trace is not None:
+                trace.record(sched.evaluations, state["best_mk"])
+            continue
+        _, mk, cand, attr, key = pick
+        cur, cur_key = cand, key
+        state["cur"], state["cur_key"] = cur, cur_key
+        tabu[attr] = it + (tabu_size or rng.randint(base, max_tenure))
+        freq[attr] = freq.get(attr, 0) + 1
+        if len(tabu) > 2 * max_tenure + 64:             # drop expired entries
+            tabu = state["tabu"] = {a: e for a, e in tabu.items() if e > it}
+        if mk < state["best_mk"]:
+            state["best_mk"] = mk
+            state["best"] = cand[:]
+        if trace is not None:
+            trace.record(sched.evaluations, state["best_mk"])
+    return state
+
+def tabu_search(
     instance_data,
-    inst_name: str,
-    csv_path: str,
-    scenario_id: int,
     machine_status: dict | None = None,
     max_iters: int = 250,
-    tabu_size: int = 15
-) -> list[list]:
+    tabu_size: int | None = 15,
+    freq_weight: float = 0.0,
+    max_evals: int | None = None,
+    time_limit: float | None = None,
+    rng=random,
+    trace=None,
+    checkpoint: str | None = None,
+    checkpoint_every: int = 50
+) -> dict:
     """
-    Tabu Search that respects broken machines / noise.
+    Tabu Search that respects broken machines / noise; no I/O.
     - instance_data: dict with "jobs" and "num_machines"
     - machine_status: { machine_id: "broken" | float multiplier }
-    Returns [[inst_name, "TS", best_mk, scenario_id, best_seq]]
-    and appends one line to csv_path for the best makespan.
+    - tabu_size: fixed tenure (the original 15 by default), or None for one
+      tied to instance size; freq_weight: long-term frequency penalty (see
+      walk), off by default; tabu_size=None, freq_weight=1.0 turn on the
+      adaptive memory
+    - max_evals / time_limit: optional budget; the search stops early once
+      it is spent (set max_iters high to run purely on budget)
+    - trace: optional convergence.Convergence, fed the best so far per iteration
+    - checkpoint: optional path; the walk state (tabu and frequency memory,
+      incumbent), RNG state and counters are saved every `checkpoint_every`
+      iterations; an existing file written with the same parameters and
+      initial RNG state is resumed, and the file is removed at the end
+      (see checkpoint.py)
+    Returns {"sequence", "ops", "makespan" (under machine_status),
+             "evaluations", "iterations", "exhausted"}.
     """
     jobs = instance_data["jobs"]
     nm = instance_data["num_machines"]
+    sched = Scheduler(nm, use_cache=True, max_evals=max_evals, time_limit=time_limit)
+
+    # Initial random solution (or the checkpointed walk), then walk up to
+    # max_iters iterations in total
+    n_ops = sum(len(ops) for ops in jobs)
+    tag = {"params": {"machine_status": machine_status, "max_iters": max_iters, "tabu_size": tabu_size,
+                      "freq_weight": freq_weight, "max_evals": max_evals},
+           "seed": hash(rng.getstate())}
+    ckpt = load_checkpoint(checkpoint, "TS", n_ops=n_ops, **tag)
+    if ckpt is not None:
+        state = ckpt["state"]
+        rng.setstate(ckpt["rng"])
+        sched.evaluations = ckpt["evaluations"]
+        if trace is not None and ckpt["trace"] is not None:
+            vars(trace).update(vars(ckpt["trace"]))
+    else:
+        state = walk_start(jobs, sched, machine_status, random_solution(jobs, rng))
+        if trace is not None:
+            trace.record(sched.evaluations, state["best_mk"])
+    exhausted = False
+    try:
+        while state["it"] < max_iters:
+            n = max_iters - state["it"]
+            walk(jobs, sched, machine_status, state, min(n, checkpoint_every) if checkpoint else n,
+                  tabu_size, rng, freq_weight, trace)
+            if checkpoint and state["it"] < max_iters:
+                save_checkpoint(checkpoint, {"kind": "TS", "n_ops": n_ops, **tag, "state": state,
+                                             "rng": rng.getstate(), "evaluations": sched.evaluations,
+                                             "trace": trace})
+    except BudgetExhausted:
+        exhausted = True
+    clear_checkpoint(checkpoint)
+    evaluations = sched.evaluations
+    sched.set_budget()
+
+    # Final decode and (re-)evaluation under machine_status
+    best_ops = decode(state["best"], jobs)
+    final_mk = sched.calculate_makespan(best_ops, machine_status=machine_status)
+    return {"sequence": state["best"], "ops": best_ops, "makespan": final_mk,
+            "evaluations": evaluations, "iterations": state["it"], "exhausted": exhausted}
+
+def _log(csv_path, sink, inst_name, final_mk, scenario_id):
+    """The result line, to a sink and/or appended to csv_path."""
+    if sink is not None:
+        sink.emit({"Instance": inst_name, "Algorithm": "TS",
+                   "Makespan": final_mk, "ScenarioID": scenario_id})
+    if csv_path:
+        with open(csv_path, "a", newline="") as f:
+            csv.writer(f).writerow([inst_name, "TS", final_mk, scenario_id])
+
+def run_tabu_search(
+    instance_data,
+    inst_name: str,
+    csv_path: str | None = None,
+    scenario_id: int = 0,
+    machine_status: dict | None = None,
+    max_iters: int = 250,
+    tabu_size: int | None = 15,
+    freq_weight: float = 0.0,
+    max_evals: int | None = None,
+    time_limit: float | None = None,
+    stats: dict | None = None,
+    sink=None,
+    trace=None,
+    checkpoint: str | None = None,
+    checkpoint_every: int = 50
+) -> list[list]:
+    """
+    tabu_search in the runner's row format. The result line goes to `sink`
+    (see sinks.py) and, if given, is appended to csv_path.
+    - stats: optional dict that receives {"evaluations": n}
+    - trace, checkpoint, checkpoint_every: optional, see tabu_search; a run
+      finding its checkpoint file resumes from it, like GeneticAlgorithm.run
+    Returns [[inst_name, "TS", best_mk, scenario_id, best_ops]].
+    """
+    res = tabu_search(instance_data, machine_status, max_iters, tabu_size, freq_weight,
+                      max_evals, time_limit, trace=trace, checkpoint=checkpoint,
+                      checkpoint_every=checkpoint_every)
+    if stats is not None:
+        stats["evaluations"] = res["evaluations"]
+    _log(csv_path, sink, inst_name, res["makespan"], scenario_id)
+    return [[inst_name, "TS", res["makespan"], scenario_id, res["ops"]]]
+
+
+# --------------------------------------------------------------------------- #
+#  Multi-start: K trajectories in worker processes sharing an elite pool      #
+# --------------------------------------------------------------------------- #
+def _ts_round(args):
+    """One round of one trajectory in a worker; (state, evaluations)."""
+    jobs, nm, machine_status, seq, state, iters, tabu_size, freq_weight, seed = args
+    rng = random.Random(seed)
     sched = Scheduler(nm, use_cache=True)
+    if state is None:
+        state = walk_start(jobs, sched, machine_status, seq)
+    walk(jobs, sched, machine_status, state, iters, tabu_size, rng, freq_weight)
+    return state, sched.evaluations
 
-    # Initial random solution
-    cur = _random_solution(jobs)
-    best = cur[:]
-    # Evaluate initial
-    init_ops = _decode(best, jobs)
-    best_mk = sched.calculate_makespan(init_ops, machine_status=machine_status)
+def run_parallel_tabu_search(
+    instance_data,
+    inst_name: str,
+    csv_path: str | None = None,
+    scenario_id: int = 0,
+    machine_status: dict | None = None,
+    n_starts: int = 8,
+    rounds: int = 10,
+    iters_per_round: int = 25,
+    tabu_size: int | None = 15,
+    freq_weight: float = 0.0,
+    elite_size: int = 5,
+    patience: int = 2,
+    perturb: float = 0.1,
+    seed: int | None = None,
+    processes: int | None = None,
+    stats: dict | None = None,
+    sink=None
+) -> list[list]:
+    """
+    Multi-start Tabu Search: `n_starts` trajectories run `iters_per_round`
+    iterations per round in a process pool. After each round their bests go
+    into an elite pool (distinct schedules only); a trajectory that has not
+    improved its own best for `patience` rounds restarts from an elite with a
+    `perturb` fraction of positions randomly swapped.
+    Same return value and result line as run_tabu_search.
+    """
+    jobs = instance_data["jobs"]
+    nm = instance_data["num_machines"]
+    sched = Scheduler(nm)
+    rng = random.Random(seed)
+    n = sum(len(ops) for ops in jobs)
 
-    tabu = []
-    for _ in range(max_iters):
-        # Generate neighbors by swapping two positions
-        neighbors = []
-        for _ in range(10):
-            candidate = cur[:]
-            i, j = random.sample(range(len(candidate)), 2)
-            candidate[i], candidate[j] = candidate[j], candidate[i]
-            neighbors.append((candidate, (i, j)))
+    starts = [random_solution(jobs, rng) for _ in range(n_starts)]
+    states = [None] * n_starts
+    stale, last = [0] * n_starts, [None] * n_starts
+    elite = {}                                   # canonical key -> (mk, seq)
+    evals = 0
 
-        # Evaluate all neighbors under current machine_status
-        scored = []
-        for cand, move in neighbors:
-            ops = _decode(cand, jobs)
-            mk = sched.calculate_makespan(ops, machine_status=machine_status)
-            scored.append((mk, cand, move))
-        scored.sort(key=lambda x: x[0])
+    with Pool(processes) as pool:
+        for _ in range(rounds):
+            tasks = [(jobs, nm, machine_status, starts[k], states[k], iters_per_round,
+                      tabu_size, freq_weight, rng.randrange(2**32)) for k in range(n_starts)]
+            for k, (st, ev) in enumerate(pool.map(_ts_round, tasks)):
+                states[k], evals = st, evals + ev
+                key = sched.canonical_key(decode(st["best"], jobs))
+                elite[key] = (st["best_mk"], st["best"])
+                if last[k] is not None and st["best_mk"] >= last[k]:
+                    stale[k] += 1
+                else:
+                    stale[k], last[k] = 0, st["best_mk"]
+            elite = dict(sorted(elite.items(), key=lambda kv: kv[1][0])[:elite_size])
+
+            # restart stagnated trajectories from perturbed elites
+            pool_seqs = [seq for _, seq in elite.values()]
+            for k in range(n_starts):
+                if stale[k] >= patience:
+                    seq = rng.choice(pool_seqs)[:]
+                    for _ in range(max(1, int(perturb * n))):
+                        i, j = rng.sample(range(n), 2)
+                        seq[i], seq[j] = seq[j], seq[i]
+                    starts[k], states[k], stale[k], last[k] = seq, None, 0, None
 
-        # Pick the first admissible move
-        for mk, cand, move in scored:
-            if move not in tabu:
-                cur = cand
-                tabu.append(move)
-                if len(tabu) > tabu_size:
-                    tabu.pop(0)
-                if mk < best_mk:
-                    best_mk = mk
-                    best = cand[:]
-                break
+    if stats is not None:
+        stats["evaluations"] = evals
+    best_mk, best = min(elite.values(), key=lambda v: v[0])
 
     # Final decode and (re-)evaluation under machine_status
-    best_ops = _decode(best, jobs)
+    best_ops = decode(best, jobs)
     final_mk = sched.calculate_makespan(best_ops, machine_status=machine_status)
-
-    # Log to CSV
-    with open(csv_path, "a", newline="") as f:
-        csv.writer(f).writerow([inst_name, "TS", final_mk, scenario_id])
-
+    _log(csv_path, sink, inst_name, final_mk, scenario_id)
     return [[inst_name, "TS", final_mk, scenario_id, best_ops]]
@@ -0,0 +1,113 @@
+import glob, os, sys, warnings
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from convergence import load_traces
+
+# Anytime analysis of the convergence traces main.py writes for static runs
+# (results/convergence/<instance>_static_<algorithm>.npz):
+#   • anytime_gap.png   – median (and IQR) % gap to best-known vs evaluations
+#   • anytime_ecdf.png  – runtime ECDF: share of (run, target) pairs reached,
+#                         targets = best-known × (1 + TAUS)
+#   • anytime_budget.csv – per algorithm, evaluations after which runs are
+#                         within 0.5 % / 0.1 % / 0 of their final makespan
+BEST_KNOWN = {
+    "ft06": 55, "ft10": 930, "ft20": 1165,
+    "la01": 666, "la10": 958, "la20": 902, "la30": 1355,
+}
+CONV_DIR = "results/convergence"
+TAUS = (0.0, 0.01, 0.02, 0.05, 0.10, 0.20)
+GRID = np.unique(np.geomspace(1, 1e7, 141).astype(np.int64))
+
+
+def step(run: dict, grid: np.ndarray) -> np.ndarray:
+    """Best so far at each grid point (nan before the first record, held after the last)."""
+    i = np.searchsorted(run["evals"], grid, side="right") - 1
+    return np.where(i >= 0, run["best"][np.maximum(i, 0)], np.nan)
+
+
+def load_all() -> pd.DataFrame:
+    rows = []
+    for path in sorted(glob.glob(os.path.join(CONV_DIR, "*_static_*.npz"))):
+        inst, _, alg = os.path.basename(path)[:-4].split("_", 2)
+        if inst not in BEST_KNOWN:
+            continue
+        for rep, run in enumerate(load_traces(path)):
+            rows.append({"Instance": inst, "Algorithm": alg, "Rep": rep, "Run": run})
+    return pd.DataFrame(rows)
+
+
+# --------------------------------------------------------------------------- #
+def gap_curves(df: pd.DataFrame) -> dict:
+    """Algorithm -> (runs × GRID) matrix of % gap to best-known."""
+    out = {}
+    for alg, g in df.groupby("Algorithm"):
+        out[alg] = np.vstack([(step(r, GRID) / BEST_KNOWN[i] - 1) * 100
+                              for i, r in zip(g["Instance"], g["Run"])])
+    return out
+
+
+def ecdf(df: pd.DataFrame) -> dict:
+    """Algorithm -> share of (run, target) pairs reached by each GRID budget."""
+    out = {}
+    for alg, g in df.groupby("Algorithm"):
+        hit = []
+        for inst, run in zip(g["Instance"], g["Run"]):
+            best = step(run, GRID)
+            hit += [best <= BEST_KNOWN[inst] * (1 + tau) for tau in TAUS]
+        out[alg] = np.mean(hit, axis=0)
+    return out
+
+
+def budget_table(df: pd.DataFrame) -> pd.DataFrame:
+    """Median evaluations until a run is within a fraction of its own final makespan."""
+    rows = []
+    for alg, g in df.groupby("Algorithm"):
+        row = {"Algorithm": alg, "Runs": len(g),
+               "TotalEvals": int(np.median([r["evals"][-1] for r in g["Run"]]))}
+        for tol in (0.005, 0.001, 0.0):
+            need = [r["evals"][np.argmax(r["best"] <= r["best"][-1] * (1 + tol))] for r in g["Run"]]
+            row[f"Within{tol:.1%}"] = int(np.median(need))
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+# --------------------------------------------------------------------------- #
+if __name__ == "__main__":
+    df = load_all()
+    if df.empty:
+        sys.exit(f"no static convergence traces under {CONV_DIR}")
+    last = max(r["evals"][-1] for r in df["Run"])
+    x = GRID[GRID <= last]
+    warnings.filterwarnings("ignore", "All-NaN slice")    # budgets before any run's first record
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    for alg, m in gap_curves(df).items():
+        m = m[:, :len(x)]
+        med = np.nanmedian(m, axis=0)
+        lo, hi = np.nanpercentile(m, [25, 75], axis=0)
+        ax.plot(x, med, label=alg)
+        ax.fill_between(x, lo, hi, alpha=0.15)
+    ax.set(xscale="log", xlabel="evaluations", ylabel="gap to best-known (%)",
+           title="Anytime performance (static, median and IQR)")
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig("results/anytime_gap.png", dpi=150)
+
+    fig, ax = plt.subplots(figsize=(7, 4.5))
+    for alg, share in ecdf(df).items():
+        ax.step(x, share[:len(x)], where="post", label=alg)
+    ax.set(xscale="log", ylim=(0, 1), xlabel="evaluations", ylabel="share of (run, target) pairs",
+           title=f"Runtime ECDF, targets best-known × (1 + {', '.join(map(str, TAUS))})")
+    ax.legend(fontsize=8)
+    fig.tight_layout()
+    fig.savefig("results/anytime_ecdf.png", dpi=150)
+
+    table = budget_table(df)
+    table.to_csv("results/anytime_budget.csv", index=False)
+    print(table.to_string(index=False))
@@ -0,0 +1,132 @@
+import hashlib, json, os
+from itertools import combinations
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+# CSVs produced by main.py
+FILES = {
+    "Static":    "results/results_static.csv",
+    "Mixed":     "results/results_mixed.csv",
+    "Breakdown": "results/results_breakdown.csv",
+    "TimeNoise": "results/results_timenoise.csv",
+    "NewJob":    "results/results_newjob.csv",
+}
+B, ALPHA = 10_000, 0.05
+CACHE_PATH = "bootstrap_cache.json"
+OUT_PATH = "bootstrap_ci.csv"
+
+# --------------------------------------------------------------------------- #
+#  Vectorised bootstrap engine                                                #
+# --------------------------------------------------------------------------- #
+def resample_means(x: np.ndarray, rng: np.random.Generator, b: int = B) -> np.ndarray:
+    """Means of `b` resamples of `x`, drawn as one (b × n) index matrix."""
+    idx = rng.integers(0, x.size, size=(b, x.size))
+    return x[idx].mean(axis=1)
+
+
+def bootstrap_ci(x, base=None, b: int = B, alpha: float = ALPHA, seed: int = 0):
+    """
+    Percentile CI for mean(x), or — when `base` is given — for the percentage
+    gap (mean(x) - mean(base)) / mean(base) * 100 with both samples resampled
+    independently.  Returns (estimate, low, high).
+    """
+    rng = np.random.default_rng(seed)
+    x = np.asarray(x, dtype=float)
+    xb = resample_means(x, rng, b)
+    if base is None:
+        est, stat = x.mean(), xb
+    else:
+        base = np.asarray(base, dtype=float)
+        yb = resample_means(base, rng, b)
+        est = (x.mean() - base.mean()) / base.mean() * 100
+        stat = (xb - yb) / yb * 100
+    lo, hi = np.percentile(stat, [100 * alpha / 2, 100 * (1 - alpha / 2)])
+    return float(est), float(lo), float(hi)
+
+
+def _key(x, base, b, alpha) -> str:
+    h = hashlib.sha1(np.asarray(x, dtype=float).tobytes())
+    if base is not None:
+        h.update(b"|" + np.asarray(base, dtype=float).tobytes())
+    h.update(f"|{b}|{alpha}".encode())
+    return h.hexdigest()
+
+
+def _worker(task):
+    key, x, base, b, alpha = task
+    # seed from the data hash so cached and fresh results are identical
+    return key, bootstrap_ci(x, base, b, alpha, seed=int(key[:8], 16))
+
+
+def run_groups(groups: list[dict], b: int = B, alpha: float = ALPHA,
+               cache_path: str | None = CACHE_PATH) -> pd.DataFrame:
+    """
+    groups: [{"x": array, "base": array | None, **labels}, …]
+    Groups whose input hash is already cached are not recomputed; the rest
+    are spread over a process pool.
+    """
+    cache = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    keys = [_key(g["x"], g.get("base"), b, alpha) for g in groups]
+    todo = {k: (k, g["x"], g.get("base"), b, alpha)
+            for k, g in zip(keys, groups) if k not in cache}
+    if todo:
+        with Pool() as pool:
+            cache.update(pool.map(_worker, todo.values(), chunksize=16))
+        if cache_path:
+            with open(cache_path, "w") as f:
+                json.dump(cache, f)
+
+    rows = []
+    for k, g in zip(keys, groups):
+        est, lo, hi = cache[k]
+        labels = {c: v for c, v in g.items() if c not in ("x", "base")}
+        rows.append({**labels, "Estimate": est, "CI low": lo, "CI high": hi})
+    return pd.DataFrame(rows)
+
+# --------------------------------------------------------------------------- #
+#  Groups: mean makespan, gain over static baseline, pairwise gaps            #
+# --------------------------------------------------------------------------- #
+def build_groups(frames: dict[str, pd.DataFrame]) -> list[dict]:
+    static = frames.get("Static")
+    groups = []
+    for scen, df in frames.items():
+        samples = {k: g["Makespan"].to_numpy(float)
+                   for k, g in df.groupby(["Instance", "Algorithm"])}
+        for (inst, alg), x in samples.items():
+            groups.append({"Scenario": scen, "Instance": inst, "Algorithm": alg,
+                           "Versus": "", "Statistic": "Mean", "x": x})
+            if scen != "Static" and static is not None:
+                base = static[(static["Instance"] == inst) & (static["Algorithm"] == alg)]
+                if len(base):
+                    groups.append({"Scenario": scen, "Instance": inst, "Algorithm": alg,
+                                   "Versus": "Static", "Statistic": "Gain%", "x": x,
+                                   "base": base["Makespan"].to_numpy(float)})
+        for inst in df["Instance"].unique():
+            algs = sorted(a for i, a in samples if i == inst)
+            for a1, a2 in combinations(algs, 2):
+                groups.append({"Scenario": scen, "Instance": inst, "Algorithm": a1,
+                               "Versus": a2, "Statistic": "Gap%",
+                               "x": samples[(inst, a1)], "base": samples[(inst, a2)]})
+    return groups
+
+
+def main() -> None:
+    frames = {}
+    for scen, path in FILES.items():
+        if not os.path.exists(path):
+            print(f"WARNING: {path} not found; skipping {scen}.")
+            continue
+        frames[scen] = pd.read_csv(path).rename(columns=lambda c: c.strip())
+    res = run_groups(build_groups(frames))
+    res.round(3).to_csv(OUT_PATH, index=False)
+    print(f"✓ wrote {OUT_PATH} ({len(res)} intervals)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from rescheduler import simulate_anytime_rescheduling
+
+# The schedule a step commits is the one the next step starts from: with no
+# event in between (static scenario), the next step's first publication must
+# equal the previous step's reported best.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+LA30 = next(i for i in load_instances(DATA) if i["name"] == "la30")
+
+
+def test_committed_schedule_is_step_best():
+    for _ in range(5):
+        report = []
+        simulate_anytime_rescheduling(LA30, 0, max_time=100, ga_params={"pop_size": 20},
+                                      deadline=0.4, interval=0.05, report=report)
+        assert [r["event"] for r in report] == ["initial", "finish"]
+        assert report[1]["first_mk"] == report[0]["final_mk"]
@@ -0,0 +1,47 @@
+import os, pickle, sqlite3, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from broker import Broker, spawn
+
+# Local worker processes stand in for hosts: a worker that dies mid-task
+# loses its lease and the task is handed out again.
+
+
+def double(x):
+    return 2 * x
+
+
+def crash_once(marker):
+    """Kill the worker process the first time, succeed on the retry."""
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return "survived"
+
+
+def test_lost_task_is_leased_again(tmp_path):
+    db, marker = str(tmp_path / "broker.sqlite"), str(tmp_path / "crashed")
+    b = Broker(db, lease=1.0, namespace="test")
+    assert b.publish("exp", [("crash", crash_once, marker)] +
+                     [(f"k{i}", double, i) for i in range(10)]) == 11
+    assert b.publish("exp", [("k1", double, 1)]) == 0          # already queued
+    spawn(db, 3, lease=1.0, namespace="test")
+    assert b.progress("exp") == {"pending": 0, "running": 0, "done": 11, "failed": 0}
+    res = {key: r for key, _, r in b.results("exp")}
+    assert res == {"crash": "survived", **{f"k{i}": 2 * i for i in range(10)}}
+    with sqlite3.connect(db) as c:
+        assert c.execute("SELECT attempts FROM tasks WHERE key = 'crash'").fetchone() == (2,)
+
+
+def test_namespaces_and_unloadable_tasks(tmp_path):
+    db = str(tmp_path / "broker.sqlite")
+    main, other = Broker(db, namespace="main", max_attempts=1), Broker(db, namespace="other")
+    main.publish("main", [("ok", double, 4)])
+    other.publish("other", [("theirs", double, 5)])
+    with sqlite3.connect(db) as c:                              # its function no longer exists
+        c.execute("INSERT INTO tasks (namespace, experiment, key, payload) VALUES ('main', 'main', 'bad', ?)",
+                  (pickle.dumps((double, 1)).replace(b"double", b"dooble"),))
+    assert main.work(poll=0.01) == 1
+    assert main.progress("main") == {"pending": 0, "running": 0, "done": 1, "failed": 1}
+    assert "AttributeError" in main.failures("main")[0][1]
+    assert other.progress("other")["pending"] == 1
@@ -0,0 +1,84 @@
+import os, random, sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from ga import GeneticAlgorithm
+from scheduler import Scheduler
+from tabu import tabu_search
+from convergence import Convergence
+
+# A run killed after a checkpoint and resumed ends exactly like an
+# uninterrupted run; a finished run leaves no checkpoint behind, and one
+# written by a differently configured run is refused.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+LA20 = next(i for i in load_instances(DATA) if i["name"] == "la20")
+LA20.setdefault("num_jobs", len(LA20["jobs"]))
+
+
+class Killed(Exception):
+    pass
+
+
+class KillAt(Convergence):
+    """Trace that raises once `evals` evaluations are reached (a preempted host)."""
+
+    def __init__(self, evals):
+        super().__init__()
+        self.at = evals
+
+    def record(self, evals, best):
+        if evals >= self.at:
+            raise Killed
+        super().record(evals, best)
+
+
+def _ga(**kw):
+    return GeneticAlgorithm(LA20, pop_size=30, num_generations=23, local_search_swaps=5,
+                            rng_seed=7, **kw)
+
+
+@pytest.mark.parametrize("kw", [{}, {"adaptive": True, "screen": 0.5}, {"dedup": True},
+                                {"replacement": "steady"}, {"robust": "mean", "robust_max_samples": 16}])
+def test_ga_resume(tmp_path, kw):
+    ck = str(tmp_path / "ga.ckpt")
+    sched, conv = Scheduler(10), Convergence()
+    ref = _ga(**kw).run(LA20, sched, trace=conv)
+    with pytest.raises(Killed):
+        _ga(**kw).run(LA20, Scheduler(10), trace=KillAt(sched.evaluations // 2),
+                      checkpoint=ck, checkpoint_every=5)
+    assert os.path.exists(ck)
+    sched2, conv2 = Scheduler(10), Convergence()
+    assert _ga(**kw).run(LA20, sched2, trace=conv2, checkpoint=ck, checkpoint_every=5) == ref
+    assert sched2.evaluations == sched.evaluations
+    assert np.array_equal(conv2.arrays()["best"], conv.arrays()["best"])
+    assert not os.path.exists(ck)
+
+
+def test_ga_refuses_other_run(tmp_path):
+    ck = str(tmp_path / "ga.ckpt")
+    with pytest.raises(Killed):
+        _ga().run(LA20, Scheduler(10), trace=KillAt(500), checkpoint=ck, checkpoint_every=2)
+    with pytest.raises(ValueError, match="params"):
+        GeneticAlgorithm(LA20, pop_size=30, num_generations=23, local_search_swaps=5,
+                         rng_seed=8).run(LA20, Scheduler(10), checkpoint=ck)
+
+
+def test_ts_resume(tmp_path):
+    ck = str(tmp_path / "ts.ckpt")
+    random.seed(3)
+    ref = tabu_search(LA20, max_iters=300)
+    random.seed(3)
+    with pytest.raises(Killed):
+        tabu_search(LA20, max_iters=300, trace=KillAt(ref["evaluations"] // 2),
+                    checkpoint=ck, checkpoint_every=40)
+    random.seed(99)
+    with pytest.raises(ValueError, match="seed"):
+        tabu_search(LA20, max_iters=300, checkpoint=ck, checkpoint_every=40)
+    random.seed(3)
+    res = tabu_search(LA20, max_iters=300, checkpoint=ck, checkpoint_every=40)
+    assert (res["sequence"], res["makespan"], res["evaluations"]) == \
+           (ref["sequence"], ref["makespan"], ref["evaluations"])
+    assert not os.path.exists(ck)
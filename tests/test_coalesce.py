@@ -0,0 +1,39 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from scenario import apply_scenario
+from rescheduler import _batches, build_agenda, simulate_dispatch_with_rescheduling
+
+# Event coalescing on the Mixed scenario's agenda:
+#   15 br_start_m2   20 br_end_m2   20 job_arrival   35 br_start_m4   45 br_end_m4
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+LA01 = next(i for i in load_instances(DATA) if i["name"] == "la01")
+AGENDA = build_agenda(apply_scenario(LA01, 4))
+
+
+def _clks(max_time=100, policy=None, urgent=None):
+    return [(clk, len(tags)) for clk, _, tags in _batches(AGENDA, max_time, policy, urgent)]
+
+
+def test_batches():
+    assert _clks() == [(15, 1), (20, 1), (20, 1), (35, 1), (45, 1)]
+    assert _clks(policy={"window": 10}) == [(20, 3), (45, 2)]
+    assert _clks(policy={"busy": 30}) == [(15, 1), (45, 4)]
+    assert _clks(policy={"window": 10}, urgent=lambda tag: tag.startswith("br_start")) == \
+           [(15, 1), (20, 2), (35, 1), (45, 1)]
+
+
+def test_horizon():
+    assert _clks(max_time=30) == [(15, 1), (20, 1), (20, 1)]
+    assert _clks(max_time=40, policy={"busy": 30}) == [(15, 1), (40, 3)]   # delayed to 45, clipped
+
+
+def test_report():
+    report = {}
+    hist = simulate_dispatch_with_rescheduling(LA01, 4, coalesce={"window": 10}, report=report)
+    assert report == {"events": 5, "optimisations": 2, "saved": 3}
+    assert [clk for clk, _ in hist] == [0, 20, 45, 100]
+    report = {}
+    simulate_dispatch_with_rescheduling(LA01, 4, report=report)
+    assert report == {"events": 5, "optimisations": 5, "saved": 0}
@@ -0,0 +1,69 @@
+import os, sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from scheduler import Scheduler
+from dispatch import RULES, dispatch
+
+# Priority dispatching: valid non-delay schedules whose reported makespan is
+# the dispatched schedule's, for every rule, machine state and release.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+INSTANCES = {i["name"]: i for i in load_instances(DATA)}
+LA01 = INSTANCES["la01"]
+
+
+def _naive(data, key):
+    """Reference non-delay dispatcher: O(ops × jobs) per step, ties to the lower job id."""
+    jobs, nm = data["jobs"], data["num_machines"]
+    nxt, j_ready, m_free = [0] * len(jobs), [0] * len(jobs), [0] * nm
+    rem = [sum(d for _, d in ops) for ops in jobs]
+    seq, end = [], 0
+    while len(seq) < sum(map(len, jobs)):
+        live = [j for j in range(len(jobs)) if nxt[j] < len(jobs[j])]
+        t = min(max(m_free[jobs[j][nxt[j]][0]], j_ready[j]) for j in live)
+        m = min(jobs[j][nxt[j]][0] for j in live if max(m_free[jobs[j][nxt[j]][0]], j_ready[j]) == t)
+        queue = [j for j in live if jobs[j][nxt[j]][0] == m and j_ready[j] <= t]
+        j = min(queue, key=lambda j: (key(jobs[j][nxt[j]][1], rem[j]), j))
+        d = jobs[j][nxt[j]][1]
+        m_free[m] = j_ready[j] = t + d
+        rem[j] -= d; nxt[j] += 1; end = max(end, t + d)
+        seq.append(j)
+    return end
+
+
+@pytest.mark.parametrize("rule", RULES + ({"SPT": 1.0, "MWKR": 1.0},))
+def test_rules(rule):
+    for data in INSTANCES.values():
+        for ms in (None, {2: "broken"}, {m: 1.15 for m in range(data["num_machines"])}):
+            res = dispatch(data, rule, machine_status=ms)
+            assert sorted(res["sequence"]) == sorted(j for j, ops in enumerate(data["jobs"]) for _ in ops)
+            sched = Scheduler(data["num_machines"])
+            assert res["makespan"] == sched.calculate_makespan(res["ops"], ms)
+            assert (np.diff(sched.timeline(res["ops"], ms).start) >= 0).all()   # dispatch order
+
+
+@pytest.mark.parametrize("rule, key", [("SPT", lambda d, rem: d), ("LPT", lambda d, rem: -d),
+                                       ("MWKR", lambda d, rem: -rem), ("LWKR", lambda d, rem: rem)])
+def test_matches_reference(rule, key):
+    for name in ("ft06", "la01", "la20"):
+        assert dispatch(INSTANCES[name], rule)["makespan"] == _naive(INSTANCES[name], key)
+
+
+def test_release():
+    n = len(LA01["jobs"])
+    base = dispatch(LA01, "MWKR")
+    late = dispatch(LA01, "MWKR", release=[100] * n)   # everything shifted
+    assert late["sequence"] == base["sequence"] and late["makespan"] == base["makespan"] + 100
+    release = [50 * (j % 3) for j in range(n)]
+    res = dispatch(LA01, "MWKR", release=release)
+    assert res["makespan"] >= max(r + sum(d for _, d in ops) for r, ops in zip(release, LA01["jobs"]))
+    assert res["makespan"] >= Scheduler(LA01["num_machines"]).calculate_makespan(res["ops"])
+
+
+def test_callable_and_unknown():
+    assert dispatch(LA01, lambda d, rem, due, t: d) == dispatch(LA01, "SPT")
+    with pytest.raises(ValueError, match="unknown dispatching rule"):
+        dispatch(LA01, "SRPT")
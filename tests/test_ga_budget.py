@@ -0,0 +1,36 @@
+import os, sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from ga import GeneticAlgorithm
+from scheduler import Scheduler
+
+# Budget smaller than the initial population: the GA must still return the
+# best individual it managed to score, within the budget.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+FT06 = next(i for i in load_instances(DATA) if i["name"] == "ft06")
+
+
+def test_budget_below_pop_size():
+    sched = Scheduler(FT06["num_machines"], max_evals=100)
+    ga = GeneticAlgorithm(FT06, pop_size=200, num_generations=10, rng_seed=1)
+    seq, mk = ga.run(FT06, sched)
+    assert sched.evaluations == 100
+    assert ga.fit is None
+    assert sorted(seq) == sorted(j for j, ops in enumerate(FT06["jobs"]) for _ in ops)
+    assert mk == Scheduler(FT06["num_machines"]).calculate_makespan(ga._decode(seq, FT06))
+
+
+def test_zero_budget():
+    sched = Scheduler(FT06["num_machines"], max_evals=0)
+    seq, mk = GeneticAlgorithm(FT06, pop_size=20, rng_seed=1).run(FT06, sched)
+    assert sched.evaluations == 0
+    assert mk == Scheduler(FT06["num_machines"]).calculate_makespan(GeneticAlgorithm._decode(seq, FT06))
+
+
+def test_stats_count_every_simulation():
+    for kw in ({"local_search": "critical"}, {"local_search": "critical", "adaptive": True}):
+        sched = Scheduler(FT06["num_machines"])
+        ga = GeneticAlgorithm(FT06, pop_size=20, num_generations=10, rng_seed=1, **kw)
+        ga.run(FT06, sched)
+        assert ga.stats["evaluations"] == sched.evaluations
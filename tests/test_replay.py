@@ -0,0 +1,38 @@
+import os, random, sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from heuristics import HEURISTICS
+from rescheduler import (simulate_dispatch_with_rescheduling, simulate_ts_with_rescheduling,
+                         simulate_with_rescheduling)
+from replay import replay_step
+from sinks import TraceSink, read_trace
+
+# Every traced rescheduling step, replayed from the JSONL trace alone,
+# reproduces the traced makespan.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+INSTANCES = {i["name"]: i for i in load_instances(DATA)}
+LA01 = INSTANCES["la01"]
+
+
+@pytest.mark.parametrize("solver", ["GA", "TS", "DR"])
+def test_replay_matches_trace(tmp_path, solver):
+    path = str(tmp_path / "trace.jsonl")
+    with TraceSink(path, batch_size=3) as sink:
+        for sid in (1, 2, 3, 4):
+            random.seed(sid)
+            if solver == "GA":
+                simulate_with_rescheduling(LA01, sid, "GASPT", HEURISTICS["GASPT"], sink=sink,
+                                           ga_params={"pop_size": 12, "num_generations": 4,
+                                                      "local_search_swaps": 3, "rng_seed": sid})
+            elif solver == "TS":
+                simulate_ts_with_rescheduling(LA01, sid, ts_params={"max_iters": 15}, sink=sink)
+            else:
+                simulate_dispatch_with_rescheduling(LA01, sid, sink=sink)
+    trace = read_trace(path)
+    assert {r["scenario"] for r in trace} == {1, 2, 3, 4}
+    assert all(r["solver"] == solver for r in trace)
+    for rec in trace:
+        assert replay_step(rec, INSTANCES)["match"], rec
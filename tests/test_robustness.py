@@ -0,0 +1,53 @@
+import math, os, random, sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from scheduler import Scheduler
+from encoding import decode, random_solution
+
+# Vectorised Monte Carlo makespans against a per-sample scalar simulation.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+LA01 = next(i for i in load_instances(DATA) if i["name"] == "la01")
+OPS = decode(random_solution(LA01["jobs"], random.Random(1)), LA01["jobs"])
+
+
+def _scalar(ops, sc, s, nm):
+    """Makespan in sample s, one operation at a time."""
+    m_ready, j_ready = [0.0] * nm, {}
+    for (j, o), (m, d) in ops:
+        d = math.floor(d * sc.factor[sc.offset[j] + o, s])
+        start = max(m_ready[m], j_ready.get(j, 0.0))
+        if start < sc.br_end[m, s] and start + d > sc.br_start[m, s]:
+            start = sc.br_end[m, s]
+        m_ready[m] = j_ready[j] = start + d
+    return max(m_ready)
+
+
+def test_nominal_samples_match_calculate_makespan():
+    sched = Scheduler(LA01["num_machines"])
+    sc = sched.sample_scenarios(LA01["jobs"], 16, noise=(1.0, 1.0), rng=np.random.default_rng(0))
+    assert (sched.makespans(OPS, sc) == sched.calculate_makespan(OPS)).all()
+
+
+def test_samples_match_scalar_simulation():
+    sched = Scheduler(LA01["num_machines"])
+    sc = sched.sample_scenarios(LA01["jobs"], 64, breakdown_prob=0.5, rng=np.random.default_rng(1))
+    x = sched.makespans(OPS, sc)
+    assert x.tolist() == [_scalar(OPS, sc, s, LA01["num_machines"]) for s in range(64)]
+    assert x.min() >= sched.calculate_makespan(OPS)
+
+
+def test_robustness_summary():
+    sched = Scheduler(LA01["num_machines"], max_evals=1)
+    r = sched.robustness(OPS, jobs=LA01["jobs"], n_samples=1000, alpha=0.9,
+                         breakdown_prob=0.2, rng=np.random.default_rng(2))
+    assert sched.evaluations == 1                       # one evaluation for all samples
+    x = np.sort(r.samples)
+    assert r.mean == pytest.approx(x.mean()) and r.std == pytest.approx(x.std())
+    assert r.quantiles[0.5] == pytest.approx(np.median(x))
+    assert r.cvar == pytest.approx(x[-100:].mean()) and r.var <= r.cvar
+    with pytest.raises(ValueError):
+        Scheduler(LA01["num_machines"]).robustness(OPS)
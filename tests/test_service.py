@@ -0,0 +1,53 @@
+import asyncio, os, sys, threading, time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from service import RescheduleService, ServiceClient
+
+# The service end to end over a Unix socket: every solver answers a breakdown,
+# a job arrival and a repair with a valid schedule of the current jobs.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+PARAMS = {"GA": {"pop_size": 10, "num_generations": 5, "local_search_swaps": 2},
+          "TS": {"max_iters": 20}, "DR": {}}
+
+
+async def _serve(path):
+    try:
+        await RescheduleService(DATA).serve(path)
+    except asyncio.CancelledError:
+        pass
+
+
+@pytest.fixture
+def socket_path(tmp_path):
+    path = str(tmp_path / "svc.sock")
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(_serve(path))
+    thread = threading.Thread(target=loop.run_until_complete, args=(task,), daemon=True)
+    thread.start()
+    for _ in range(500):
+        if os.path.exists(path):
+            break
+        time.sleep(0.01)
+    yield path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(5)
+    loop.close()
+
+
+@pytest.mark.parametrize("solver", ["GA", "TS", "DR"])
+def test_events(socket_path, solver):
+    with ServiceClient(socket_path) as c:
+        out = c.open("s", "ft06", solver=solver, params=PARAMS[solver])
+        assert len(out["sequence"]) == 36
+        out = c.event("s", "breakdown", machine=2)
+        assert out["makespan"] > 10**6                 # machine 2 carries the penalty
+        out = c.event("s", "job_arrival", ops=[[0, 3], [1, 4], [2, 5]])
+        assert sorted(out["sequence"]) == sorted([j for j in range(6) for _ in range(6)] + [6] * 3)
+        out = c.event("s", "repair", machine=2)
+        assert out["makespan"] < 10**6
+        assert c.request(op="schedule", session="s") == {k: out[k] for k in ("makespan", "sequence")}
+        assert c.request(op="ping")["sessions"] == ["s"]
+        with pytest.raises(RuntimeError, match="unknown event type"):
+            c.event("s", "flood")
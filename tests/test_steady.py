@@ -0,0 +1,35 @@
+import os, sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from loader import load_instances
+from ga import GeneticAlgorithm
+from scheduler import Scheduler
+
+# Fitness travels with the individual: unchanged individuals are never
+# re-scored, and the carried fitness is always the individual's makespan.
+DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.txt")
+LA01 = next(i for i in load_instances(DATA) if i["name"] == "la01")
+LA01.setdefault("num_jobs", len(LA01["jobs"]))
+
+
+def test_unchanged_individuals_are_not_rescored():
+    frozen = {"crossover_rate": 0.0, "mutation_rate": 0.0, "local_search_swaps": 0}
+    ga = GeneticAlgorithm(LA01, pop_size=20, num_generations=10, rng_seed=1, **frozen)
+    ga.run(LA01, Scheduler(LA01["num_machines"]))
+    assert ga.stats["evaluations"] == 20                # the initial population only
+    ga = GeneticAlgorithm(LA01, pop_size=20, num_generations=10, rng_seed=1,
+                          replacement="steady", offspring=2, **frozen)
+    ga.run(LA01, Scheduler(LA01["num_machines"]))
+    assert ga.stats["evaluations"] == 20 + 10 * 9 * 2  # + offspring per step × steps × generations
+
+
+@pytest.mark.parametrize("replacement", ["generational", "steady"])
+def test_carried_fitness_is_exact(replacement):
+    sched = Scheduler(LA01["num_machines"])
+    ga = GeneticAlgorithm(LA01, pop_size=20, num_generations=10, rng_seed=1, replacement=replacement)
+    seq, mk = ga.run(LA01, sched)
+    real = [sched.calculate_makespan(ga._decode(p.tolist(), LA01)) for p in ga.pop]
+    assert ga.fit.tolist() == real
+    assert mk == min(real) == sched.calculate_makespan(ga._decode(seq, LA01))
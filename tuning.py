@@ -0,0 +1,187 @@
+from __future__ import annotations
+import argparse, copy, json, os, random
+from multiprocessing import Pool
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+from scipy import stats
+
+from loader import load_instances
+from heuristics import HEURISTICS
+from ga import GeneticAlgorithm
+from scheduler import Scheduler
+from rescheduler import simulate_with_rescheduling, simulate_ts_with_rescheduling
+from tabu import tabu_search
+
+# Candidate values per constructor / search argument
+GA_SPACE: Dict[str, List[Any]] = {
+    "pop_size":           [30, 60, 100, 200],
+    "num_generations":    [60, 120, 250, 500, 1_000],
+    "crossover_rate":     [0.80, 0.95],
+    "mutation_rate":      [0.05, 0.20],
+    "elitism_rate":       [0.05, 0.10],
+    "local_search_swaps": [0, 15, 30],
+    "replacement":        ["generational", "steady"],
+}
+TS_SPACE: Dict[str, List[Any]] = {
+    "max_iters": [100, 250, 500, 1_000],
+    "tabu_size": [None, 5, 10, 15, 25],                # None: tied to instance size
+}
+
+
+def instance_class(inst: dict) -> str:
+    """Bucket instances by number of operations."""
+    n_ops = sum(len(ops) for ops in inst["jobs"])
+    return "small" if n_ops <= 60 else "medium" if n_ops <= 150 else "large"
+
+
+def sample_configs(space: Dict[str, List[Any]], n: int, seed: int = 0) -> List[dict]:
+    """n distinct configurations drawn uniformly from the grid."""
+    rng = random.Random(seed)
+    size = int(np.prod([len(v) for v in space.values()]))
+    seen, out = set(), []
+    while len(out) < min(n, size):
+        cfg = {k: rng.choice(v) for k, v in space.items()}
+        key = tuple(cfg.values())
+        if key not in seen:
+            seen.add(key); out.append(cfg)
+    return out
+
+
+# ------------------------------------------------------------------  one run
+def _run_config(args: Tuple[str, dict, dict, int, int, str]) -> Tuple[int, float]:
+    """
+    (makespan, cost) of one configuration on one (instance, seed) block; cost
+    is the schedule evaluations the Scheduler counted (all reschedules if dynamic).
+    """
+    solver, cfg, inst, sid, seed, vname = args
+    random.seed(seed)
+    data = copy.deepcopy(inst)
+    counts: Dict[str, Any] = {}
+    if solver == "TS":
+        if sid == 0:
+            res = tabu_search(data, **cfg)
+            return res["makespan"], res["evaluations"]
+        hist = simulate_ts_with_rescheduling(data, sid, ts_params=cfg, stats=counts)
+        return hist[-1][1], counts["evaluations"]
+
+    hfun = HEURISTICS[vname]
+    if sid == 0:
+        sched = Scheduler(data["num_machines"])
+        mk = GeneticAlgorithm(data, rng_seed=seed, **cfg).run(data, sched, hfun)[1]
+        return mk, sched.evaluations
+    hist = simulate_with_rescheduling(data, sid, vname, hfun, ga_params={**cfg, "rng_seed": seed},
+                                      stats=counts)
+    return hist[-1][1], counts["evaluations"]
+
+
+# ------------------------------------------------------------------  racing
+def _frace_survivors(y: np.ndarray, alive: List[int], alpha: float) -> List[int]:
+    """
+    One F-race step on y (blocks × alive configs, lower is better): Friedman
+    test, then Conover post-hoc against the best rank sum (Birattari 2002).
+    """
+    b, k = y.shape
+    if k == 2:
+        if np.all(y[:, 0] == y[:, 1]) or stats.wilcoxon(y[:, 0], y[:, 1]).pvalue >= alpha:
+            return alive
+        return [alive[int(np.argmin(y.mean(axis=0)))]]
+    if np.all(y == y[:, :1]) or stats.friedmanchisquare(*y.T).pvalue >= alpha:
+        return alive
+    r = np.apply_along_axis(stats.rankdata, 1, y)
+    R = r.sum(axis=0)
+    A, C = (r ** 2).sum(), b * k * (k + 1) ** 2 / 4
+    T = (k - 1) * ((R - b * (k + 1) / 2) ** 2).sum() / (A - C)
+    crit = stats.t.ppf(1 - alpha / 2, (b - 1) * (k - 1)) * np.sqrt(
+        2 * b * (1 - T / (b * (k - 1))) * (A - C) / ((b - 1) * (k - 1)))
+    return [c for c, Rc in zip(alive, R) if Rc - R.min() <= crit]
+
+
+def _halving_survivors(y: np.ndarray, alive: List[int]) -> List[int]:
+    """Keep the better half by mean within-block rank."""
+    r = np.apply_along_axis(stats.rankdata, 1, y).mean(axis=0)
+    keep = np.argsort(r, kind="stable")[:max(1, len(alive) // 2)]
+    return [alive[i] for i in sorted(keep)]
+
+
+def race(solver: str, configs: List[dict], instances: List[dict], sid: int = 0,
+         vname: str = "GA", max_blocks: int = 20, min_blocks: int = 5,
+         alpha: float = 0.05, method: str = "frace", pool: Pool | None = None) -> dict:
+    """
+    Race `configs` over blocks (instance, seed), dropping inferior ones as soon
+    as the evidence allows. Returns survivors, the best one by mean rank and
+    the cheapest survivor the F-race test (at level alpha, on all blocks run)
+    cannot tell from the best; under halving, survivors are only the top
+    fraction by mean rank, so this test is applied once at the end.
+    """
+    alive = list(range(len(configs)))
+    mk = np.full((max_blocks, len(configs)), np.nan)
+    cost = np.full_like(mk, np.nan)
+    b = 0
+    for b in range(max_blocks):
+        inst = instances[b % len(instances)]
+        tasks = [(solver, configs[c], inst, sid, 1_000 + b, vname) for c in alive]
+        res = (pool.map if pool else map)(_run_config, tasks)
+        for c, (m, k) in zip(alive, res):
+            mk[b, c], cost[b, c] = m, k
+        if len(alive) > 1 and b + 1 >= min_blocks:
+            y = mk[:b + 1, alive]
+            if method == "frace":
+                alive = _frace_survivors(y, alive, alpha)
+            elif (b + 1) & b == 0:                  # halve at blocks 1, 2, 4, 8, …
+                alive = _halving_survivors(y, alive)
+        if len(alive) == 1:
+            break
+
+    y = mk[:b + 1, alive]
+    ranks = np.apply_along_axis(stats.rankdata, 1, y).mean(axis=0)
+    mean_cost = np.nanmean(cost[:b + 1, alive], axis=0)
+    tied = _frace_survivors(y, alive, alpha) if len(alive) > 1 and b + 1 >= min_blocks else alive
+    best = alive[int(np.argmin(ranks))]
+    cheapest = min(tied, key=lambda c: mean_cost[alive.index(c)])
+    return {
+        "blocks": b + 1,
+        "evaluated": int(np.isfinite(mk).sum()),
+        "survivors": [configs[c] for c in alive],
+        "best": {**configs[best], "mean_makespan": float(np.nanmean(mk[:b + 1, best]))},
+        "cheapest": {**configs[cheapest], "mean_makespan": float(np.nanmean(mk[:b + 1, cheapest])),
+                     "mean_cost": float(mean_cost[alive.index(cheapest)])},
+    }
+
+
+# --------------------------------------------------------------------------- #
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Racing-based GA/TS parameter tuning")
+    ap.add_argument("solver", choices=["GA", "TS"])
+    ap.add_argument("--variant", default="GA", choices=list(HEURISTICS))
+    ap.add_argument("--scenario", type=int, default=0)
+    ap.add_argument("--configs", type=int, default=32)
+    ap.add_argument("--blocks", type=int, default=20)
+    ap.add_argument("--min-blocks", type=int, default=5)
+    ap.add_argument("--method", choices=["frace", "halving"], default="frace")
+    ap.add_argument("--alpha", type=float, default=0.05)
+    ap.add_argument("--out", default="tuning")
+    a = ap.parse_args()
+
+    configs = sample_configs(GA_SPACE if a.solver == "GA" else TS_SPACE, a.configs)
+    classes: Dict[str, List[dict]] = {}
+    for inst in load_instances("data.txt"):
+        classes.setdefault(instance_class(inst), []).append(inst)
+
+    os.makedirs(a.out, exist_ok=True)
+    out: Dict[str, dict] = {}
+    with Pool() as pool:
+        for cls, insts in classes.items():
+            out[cls] = race(a.solver, configs, insts, a.scenario, a.variant,
+                            a.blocks, a.min_blocks, a.alpha, a.method, pool)
+            print(f"  {cls:<6} blocks={out[cls]['blocks']:<3} "
+                  f"survivors={len(out[cls]['survivors']):<3} cheapest={out[cls]['cheapest']}")
+
+    path = os.path.join(a.out, f"{a.solver.lower()}_sc{a.scenario}_params.json")
+    with open(path, "w") as f:
+        json.dump(out, f, indent=2)
+    print(f"✓ wrote {path}")
+
+
+if __name__ == "__main__":
+    main()